@@ -11,8 +11,14 @@ Features:
 - Configurable verbosity levels
 """
 
+import asyncio
 import fnmatch
+import functools
+import hashlib
+import heapq
 import os
+import re
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 from typing import Literal
@@ -20,7 +26,6 @@ from typing import Literal
 from amplifier_core import HookResult
 
 from amplifier_bundle_python_dev import CheckConfig
-from amplifier_bundle_python_dev import check_files
 from amplifier_bundle_python_dev.models import CheckResult
 from amplifier_bundle_python_dev.models import Issue
 from amplifier_bundle_python_dev.models import Severity
@@ -33,6 +38,27 @@ ICONS = {
     "stubs": "\u25d1",  # ◑ - half circle reversed (incomplete)
 }
 
+# One line of the detailed issue list: severity label, line number, message
+DETAIL_LINE_TEMPLATE = "\u2502 {}  line {:<4}  {}"
+
+# Tool names that write or edit files
+WRITE_TOOLS = frozenset({"write_file", "edit_file", "Write", "Edit", "MultiEdit"})
+
+# Report levels, most severe first
+LEVEL_ORDER = {"error": 0, "warning": 1, "info": 2}
+SEVERITY_LEVELS = {severity: LEVEL_ORDER[severity.value] for severity in Severity}
+
+# Display category index (into _count_issues counts) for sources with a fixed category;
+# other sources are lint errors or style issues depending on severity
+TYPE_ERRORS, LINT_ERRORS, STYLE_ISSUES, STUBS = range(4)
+SOURCE_CATEGORIES = {"pyright": TYPE_ERRORS, "stub-check": STUBS, "ruff-format": STYLE_ISSUES}
+
+# Maximum number of issues listed in the injected agent context
+MAX_CONTEXT_ISSUES = 10
+
+# Maximum number of files whose check state (and cached result) is kept
+MAX_TRACKED_FILES = 512
+
 
 class FileCheckState:
     """Tracks check state for a single file across edits."""
@@ -42,6 +68,11 @@ class FileCheckState:
         self.warning_count: int = 0
         self.check_count: int = 0  # How many times we've checked this file
 
+        # Last check result and the file signature it was computed for
+        self.last_key: tuple[int, int] | None = None  # (st_mtime_ns, st_size)
+        self.last_digest: bytes | None = None
+        self.last_result: CheckResult | None = None
+
     def update(self, errors: int, warnings: int) -> tuple[int, int]:
         """Update state and return previous counts for comparison."""
         prev_errors, prev_warnings = self.error_count, self.warning_count
@@ -50,11 +81,68 @@ class FileCheckState:
         self.check_count += 1
         return prev_errors, prev_warnings
 
+    def remember(self, key: tuple[int, int], digest: bytes, result: CheckResult) -> None:
+        """Cache a result for the file content identified by key and digest."""
+        self.last_key = key
+        self.last_digest = digest
+        self.last_result = result
+
     @property
     def total_issues(self) -> int:
         return self.error_count + self.warning_count
 
 
+def _compile_patterns(patterns: list[str]) -> re.Pattern[str]:
+    """Combine glob patterns into a single regex (never matches if there are none)."""
+    if not patterns:
+        return re.compile(r"(?!)")
+    return re.compile("|".join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
+
+
+@functools.lru_cache(maxsize=4096)
+def _matches_compiled(pattern: re.Pattern[str], file_path: str) -> bool:
+    """Check a path's name or full path against a compiled pattern (memoized)."""
+    file_path = os.path.normcase(file_path)
+    return bool(pattern.match(os.path.basename(file_path)) or pattern.match(file_path))
+
+
+@functools.lru_cache(maxsize=2048)
+def _display_path(file_path: str, cwd: Path, home: Path | None) -> str:
+    """Convert absolute path to relative path for display (memoized)."""
+    try:
+        path = Path(file_path)
+
+        # If file is under cwd, show relative path
+        if path.is_absolute():
+            try:
+                rel_path = path.relative_to(cwd)
+                return str(rel_path)
+            except ValueError:
+                pass
+
+            # Try relative to home
+            if home is not None:
+                try:
+                    rel_path = path.relative_to(home)
+                    return f"~/{rel_path}"
+                except ValueError:
+                    pass
+
+        # Fallback to just filename
+        return path.name
+    except Exception:
+        return Path(file_path).name
+
+
+def _content_digest(file_path: str) -> bytes | None:
+    """Hash file content (None if the file can't be read)."""
+    try:
+        with open(file_path, "rb") as f:
+            return hashlib.blake2b(f.read(), digest_size=16).digest()
+    except OSError:
+        return None
+
+
 class PythonCheckHooks:
     """Hook handlers for automatic Python quality checking."""
 
@@ -70,17 +158,29 @@ class PythonCheckHooks:
                 - checks: list[str] (default: all) - which checks to run
                 - verbosity: str (default: "normal") - "minimal", "normal", "detailed"
                 - show_clean: bool (default: True) - show clean pass indicator
+                - batch_window_ms: int (default: 200) - coalesce edits arriving within
+                  this window into a single check run
+                - persistent_ruff: bool (default: True) - keep one ruff server process
+                  alive for format/lint checks instead of spawning ruff per edit
             working_dir: Working directory for path resolution (falls back to cwd)
         """
         config = config or {}
         self.enabled = config.get("enabled", True)
         self.working_dir = working_dir or Path.cwd()
+        try:
+            self._home: Path | None = Path.home()
+        except RuntimeError:
+            self._home = None
         self.file_patterns = config.get("file_patterns", ["*.py"])
+        self._file_pattern_re = _compile_patterns(self.file_patterns)
         self.report_level = config.get("report_level", "warning")
+        self._min_level = LEVEL_ORDER.get(self.report_level, 1)
         self.auto_inject = config.get("auto_inject", True)
         self.checks = config.get("checks", ["format", "lint", "types", "stubs"])
         self.verbosity: Literal["minimal", "normal", "detailed"] = config.get("verbosity", "normal")
         self.show_clean = config.get("show_clean", True)
+        self.batch_window = config.get("batch_window_ms", 200) / 1000
+        self.persistent_ruff = config.get("persistent_ruff", True)
 
         # Build check config
         self.check_config = CheckConfig(
@@ -90,91 +190,146 @@ class PythonCheckHooks:
             enable_stub_check="stubs" in self.checks,
         )
 
+        # Long-lived ruff process shared by all checks (started on first use); it resolves
+        # settings within working_dir, so files outside it are checked with the ruff CLI
+        self._ruff_server = None
+        if self.persistent_ruff:
+            from amplifier_bundle_python_dev import RuffServer
+
+            self._ruff_server = RuffServer(self.working_dir)
+
         # Track file state for progress tracking (keyed by absolute path)
-        self._file_states: dict[str, FileCheckState] = {}
+        # (least recently used first, capped at MAX_TRACKED_FILES)
+        self._file_states: OrderedDict[str, FileCheckState] = OrderedDict()
 
-    def _matches_patterns(self, file_path: str) -> bool:
-        """Check if file path matches any configured pattern."""
-        path = Path(file_path)
-        for pattern in self.file_patterns:
-            if fnmatch.fnmatch(path.name, pattern):
-                return True
-            if fnmatch.fnmatch(str(path), pattern):
-                return True
-        return False
+        # Files waiting for the next batched check run (keyed by file path)
+        self._pending: dict[str, list[asyncio.Future[CheckResult]]] = {}
+        self._flush_task: asyncio.Task[None] | None = None
 
     def _filter_by_level(self, issues: list[Issue]) -> list[Issue]:
         """Filter issues by configured report level."""
-        level_order = {"error": 0, "warning": 1, "info": 2}
-        min_level = level_order.get(self.report_level, 1)
-
-        return [i for i in issues if level_order.get(i.severity.value, 0) <= min_level]
+        severity_levels = SEVERITY_LEVELS
+        min_level = self._min_level
+        return [i for i in issues if severity_levels[i.severity] <= min_level]
 
     def _get_relative_path(self, file_path: str) -> str:
         """Convert absolute path to relative path for display."""
-        try:
-            path = Path(file_path)
-            cwd = self.working_dir
+        return _display_path(file_path, self.working_dir, self._home)
 
-            # If file is under cwd, show relative path
-            if path.is_absolute():
-                try:
-                    rel_path = path.relative_to(cwd)
-                    return str(rel_path)
-                except ValueError:
-                    pass
+    def _get_file_state(self, file_path: str) -> FileCheckState:
+        """Get or create file state tracker."""
+        abs_path = os.path.abspath(file_path)
+        state = self._file_states.get(abs_path)
+        if state is None:
+            state = self._file_states[abs_path] = FileCheckState()
+            if len(self._file_states) > MAX_TRACKED_FILES:
+                self._file_states.popitem(last=False)
+        else:
+            self._file_states.move_to_end(abs_path)
+        return state
+
+    def _get_cached_result(self, file_path: str, file_state: FileCheckState, st: os.stat_result) -> CheckResult | None:
+        """Return the previous result if the file is unchanged since it was checked."""
+        if file_state.last_result is None:
+            return None
+        if (st.st_mtime_ns, st.st_size) != file_state.last_key:
+            return None
+        # Same stat signature: confirm with a content hash to catch edits within one mtime tick
+        if _content_digest(file_path) != file_state.last_digest:
+            return None
+        return file_state.last_result
+
+    def close(self) -> None:
+        """Release resources held by the hooks (the persistent ruff server)."""
+        if self._ruff_server is not None:
+            self._ruff_server.close()
+
+    async def _check_batched(self, file_path: str) -> CheckResult:
+        """Queue a file for the next batched check run and wait for its result.
+
+        Edits arriving within the batch window share a single check_files()
+        call, so ruff and pyright start once per batch instead of once per file.
+        """
+        future: asyncio.Future[CheckResult] = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(file_path, []).append(future)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after(self.batch_window))
+        return await future
 
-                # Try relative to home
-                home = Path.home()
-                try:
-                    rel_path = path.relative_to(home)
-                    return f"~/{rel_path}"
-                except ValueError:
-                    pass
+    async def _flush_after(self, delay: float) -> None:
+        """Wait for the batch window to close, then check all pending files."""
+        # Imported here so loading the hook module doesn't pull in the checker machinery
+        from amplifier_bundle_python_dev import check_files
 
-            # Fallback to just filename
-            return path.name
-        except Exception:
-            return Path(file_path).name
+        await asyncio.sleep(delay)
+        pending, self._pending = self._pending, {}
+        self._flush_task = None
 
-    def _get_file_state(self, file_path: str) -> FileCheckState:
-        """Get or create file state tracker."""
-        abs_path = str(Path(file_path).resolve())
-        if abs_path not in self._file_states:
-            self._file_states[abs_path] = FileCheckState()
-        return self._file_states[abs_path]
-
-    def _categorize_issues(self, issues: list[Issue]) -> dict[str, list[Issue]]:
-        """Categorize issues by type for display."""
-        categories: dict[str, list[Issue]] = {
-            "type_errors": [],
-            "lint_errors": [],
-            "style_issues": [],
-            "stubs": [],
-        }
+        try:
+            # check_files blocks on subprocesses; run it off the event loop so other
+            # events (and the next batch) aren't stalled behind it
+            result = await asyncio.to_thread(
+                check_files, list(pending), config=self.check_config, ruff_server=self._ruff_server
+            )
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        slices = self._split_by_file(result, list(pending))
+        for file_path, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    # Each waiter gets its own copy since callers filter issues in place
+                    future.set_result(
+                        CheckResult(
+                            issues=list(slices[file_path]),
+                            files_checked=1,
+                            checks_run=list(result.checks_run),
+                        )
+                    )
+
+    def _split_by_file(self, result: CheckResult, file_paths: list[str]) -> dict[str, list[Issue]]:
+        """Demultiplex a batched result into per-file issue lists."""
+        if len(file_paths) == 1:
+            return {file_paths[0]: result.issues}
+
+        slices: dict[str, list[Issue]] = {path: [] for path in file_paths}
+        by_abs_path = {os.path.abspath(path): path for path in file_paths}
+        for issue in result.issues:
+            if not issue.file:
+                # Tool-level issues (e.g. checker not installed) apply to every file
+                for issues in slices.values():
+                    issues.append(issue)
+                continue
+            file_path = by_abs_path.get(os.path.abspath(issue.file))
+            if file_path is not None:
+                slices[file_path].append(issue)
+        return slices
+
+    def _count_issues(self, issues: list[Issue]) -> tuple[int, int, int, int]:
+        """Count issues by display category in a single pass.
+
+        Returns:
+            Tuple of (type_errors, lint_errors, style_issues, stubs)
+        """
+        counts = [0, 0, 0, 0]
+        category_of = SOURCE_CATEGORIES.get
+        error = Severity.ERROR
 
         for issue in issues:
-            if issue.source == "pyright":
-                categories["type_errors"].append(issue)
-            elif issue.source == "stub-check":
-                categories["stubs"].append(issue)
-            elif issue.source == "ruff-format":
-                categories["style_issues"].append(issue)
-            elif issue.severity == Severity.ERROR:
-                categories["lint_errors"].append(issue)
-            else:
-                categories["style_issues"].append(issue)
+            counts[category_of(issue.source, LINT_ERRORS if issue.severity is error else STYLE_ISSUES)] += 1
 
-        return categories
+        type_errors, lint_errors, style_issues, stubs = counts
+        return type_errors, lint_errors, style_issues, stubs
 
-    def _format_category_summary(self, categories: dict[str, list[Issue]]) -> str:
-        """Format issue categories into a readable summary."""
+    def _format_category_summary(self, counts: tuple[int, int, int, int]) -> str:
+        """Format issue category counts into a readable summary."""
         parts = []
 
-        type_errors = len(categories["type_errors"])
-        lint_errors = len(categories["lint_errors"])
-        style_issues = len(categories["style_issues"])
-        stubs = len(categories["stubs"])
+        type_errors, lint_errors, style_issues, stubs = counts
 
         if type_errors:
             parts.append(f"{type_errors} type error{'s' if type_errors != 1 else ''}")
@@ -187,11 +342,12 @@ class PythonCheckHooks:
 
         return ", ".join(parts) if parts else "no issues"
 
-    def _get_severity_icon(self, result: CheckResult, categories: dict[str, list[Issue]]) -> str:
+    def _get_severity_icon(self, result: CheckResult, counts: tuple[int, int, int, int]) -> str:
         """Get appropriate icon based on severity."""
+        type_errors, lint_errors, _, stubs = counts
         if result.clean:
             return ICONS["clean"]
-        if categories["stubs"] and not categories["type_errors"] and not categories["lint_errors"]:
+        if stubs and not type_errors and not lint_errors:
             return ICONS["stubs"]
         if result.error_count > 0:
             return ICONS["errors"]
@@ -206,9 +362,9 @@ class PythonCheckHooks:
         prev_warnings: int,
     ) -> tuple[str, Literal["info", "warning", "error"]]:
         """Format the user-facing message based on verbosity and state."""
-        categories = self._categorize_issues(result.issues)
-        icon = self._get_severity_icon(result, categories)
-        category_summary = self._format_category_summary(categories)
+        counts = self._count_issues(result.issues)
+        icon = self._get_severity_icon(result, counts)
+        category_summary = self._format_category_summary(counts)
 
         # Determine message level
         if result.clean:
@@ -248,20 +404,22 @@ class PythonCheckHooks:
 
     def _format_detailed_issues(self, result: CheckResult, max_issues: int = 5) -> str:
         """Format detailed issue lines for expanded display."""
-        lines = []
-
-        # Sort issues: errors first, then by line number
-        sorted_issues = sorted(
+        # Select the first issues (errors first, then by line number) without sorting them all
+        top_issues = heapq.nsmallest(
+            max_issues,
             result.issues,
-            key=lambda i: (0 if i.severity == Severity.ERROR else 1, i.line),
+            key=lambda i: (0 if i.severity is Severity.ERROR else 1, i.line),
         )
 
-        for issue in sorted_issues[:max_issues]:
-            severity_label = "error" if issue.severity == Severity.ERROR else "warn "
-            # Truncate message if too long
-            msg = issue.message[:60] + "..." if len(issue.message) > 63 else issue.message
-            # No leading spaces - display system handles alignment
-            lines.append(f"\u2502 {severity_label}  line {issue.line:<4}  {msg}")
+        # Truncate long messages; no leading spaces - display system handles alignment
+        lines = [
+            DETAIL_LINE_TEMPLATE.format(
+                ("warn ", "error")[issue.severity is Severity.ERROR],
+                issue.line,
+                issue.message if len(issue.message) <= 63 else issue.message[:60] + "...",
+            )
+            for issue in top_issues
+        ]
 
         if len(result.issues) > max_issues:
             remaining = len(result.issues) - max_issues
@@ -295,41 +453,45 @@ class PythonCheckHooks:
             return HookResult(action="continue")
 
         # Check if this is a file write/edit operation
-        tool_name = data.get("tool_name", "")
-        write_tools = ["write_file", "edit_file", "Write", "Edit", "MultiEdit"]
-
-        if tool_name not in write_tools:
+        if data.get("tool_name", "") not in WRITE_TOOLS:
             return HookResult(action="continue")
 
         # Extract file path from tool input
         tool_input = data.get("tool_input", {})
         file_path = tool_input.get("file_path", tool_input.get("path", ""))
 
-        if not file_path:
-            return HookResult(action="continue")
-
-        # Check if this is a Python file
-        if not self._matches_patterns(file_path):
+        # Check if this is a Python file (this runs on every write event)
+        if not file_path or not _matches_compiled(self._file_pattern_re, file_path):
             return HookResult(action="continue")
 
         # Check if file exists (might have been deleted)
-        if not Path(file_path).exists():
+        try:
+            st = os.stat(file_path)
+        except OSError:
             return HookResult(action="continue")
 
-        # Run checks
-        result = check_files([file_path], config=self.check_config)
+        # Reuse the previous result when the file is unchanged (e.g. duplicate post events)
+        file_state = self._get_file_state(file_path)
+        result = self._get_cached_result(file_path, file_state, st)
+        if result is None:
+            # Hash before checking so a concurrent edit can't be cached under this signature
+            digest = _content_digest(file_path)
+
+            # Run checks (coalesced with other edits in the same batch window)
+            result = await self._check_batched(file_path)
 
-        # Filter by report level
-        result.issues = self._filter_by_level(result.issues)
+            # Filter by report level
+            result.issues = self._filter_by_level(result.issues)
+
+            if digest is not None:
+                file_state.remember((st.st_mtime_ns, st.st_size), digest, result)
 
-        # Get display path and file state
-        display_path = self._get_relative_path(file_path)
-        file_state = self._get_file_state(file_path)
         prev_errors, prev_warnings = file_state.update(result.error_count, result.warning_count)
 
         # Handle clean pass
         if result.clean:
             if self.show_clean:
+                display_path = self._get_relative_path(file_path)
                 message, level = self._format_user_message(result, display_path, file_state, prev_errors, prev_warnings)
                 return HookResult(
                     action="continue",
@@ -348,6 +510,8 @@ class PythonCheckHooks:
             # Same as before, skip redundant message
             return HookResult(action="continue")
 
+        display_path = self._get_relative_path(file_path)
+
         # Format user message
         user_message, user_level = self._format_user_message(
             result, display_path, file_state, prev_errors, prev_warnings
@@ -360,13 +524,12 @@ class PythonCheckHooks:
 
         if self.auto_inject:
             # Inject issues into agent context (always full detail for agent)
-            context_lines = [f"Python check found issues in {display_path}:"]
-            for issue in result.issues[:10]:
-                context_lines.append(f"- {issue.format_short()}")
-            if len(result.issues) > 10:
-                context_lines.append(f"  ... and {len(result.issues) - 10} more issues")
-
-            context_text = "\n".join(context_lines)
+            issues = result.issues
+            context_text = f"Python check found issues in {display_path}:\n- " + "\n- ".join(
+                map(Issue.format_short, issues[:MAX_CONTEXT_ISSUES])
+            )
+            if len(issues) > MAX_CONTEXT_ISSUES:
+                context_text += f"\n  ... and {len(issues) - MAX_CONTEXT_ISSUES} more issues"
 
             return HookResult(
                 action="inject_context",
@@ -415,6 +578,7 @@ async def mount(coordinator: Any, config: dict[str, Any] | None = None) -> dict[
         priority=15,  # Run after most other hooks but before logging
         name="python-check",  # Explicit name for source attribution
     )
+    coordinator.register_cleanup(hooks.close)
 
     return {
         "name": "hooks-python-check",
@@ -428,5 +592,6 @@ async def mount(coordinator: Any, config: dict[str, Any] | None = None) -> dict[
             "checks": hooks.checks,
             "verbosity": hooks.verbosity,
             "show_clean": hooks.show_clean,
+            "persistent_ruff": hooks.persistent_ruff,
         },
     }
@@ -4,15 +4,184 @@ This module provides the `python_check` tool that agents can use to
 check Python code for formatting, linting, type errors, and stubs.
 """
 
+import asyncio
+import dataclasses
+import functools
+import glob
+import hashlib
+import os
+import sysconfig
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from pathlib import Path
 from typing import Any
 
 from amplifier_core import ToolResult
-from amplifier_bundle_python_dev import CheckConfig, check_content, check_files
+
+from amplifier_bundle_python_dev import CheckConfig
+from amplifier_bundle_python_dev import CheckResult
+from amplifier_bundle_python_dev import Issue
+
+# Config files whose changes invalidate cached directory results
+CONFIG_FILE_NAMES = frozenset({"pyproject.toml", "ruff.toml", ".ruff.toml", "pyrightconfig.json"})
+
+# Number of directory scan results kept for reuse
+MAX_CACHED_SCANS = 16
+
+# Number of content check results kept for reuse
+MAX_CACHED_CONTENT = 256
+
+# Directory entries a project snapshot may visit before the project counts as too big to cache
+MAX_SNAPSHOT_ENTRIES = 20_000
+
+
+def _environment_dirs(scan_roots: list[str]) -> list[str]:
+    """site-packages directories pyright may resolve third-party imports from.
+
+    That is the project's .venv, the active virtualenv and this interpreter's
+    own. A directory's mtime changes whenever a package is installed,
+    upgraded or removed in it.
+    """
+    dirs = {sysconfig.get_path("purelib"), sysconfig.get_path("platlib")}
+    venvs = [os.path.join(root, ".venv") for root in scan_roots]
+    active_venv = os.environ.get("VIRTUAL_ENV")
+    if active_venv:
+        venvs.append(active_venv)
+    for venv in venvs:
+        venv = glob.escape(venv)
+        dirs.update(glob.glob(os.path.join(venv, "lib", "python*", "site-packages")))
+        dirs.update(glob.glob(os.path.join(venv, "Lib", "site-packages")))
+    return sorted(dirs)
+
+
+def _snapshot_tree(roots: list[str | Path]) -> tuple[tuple[str, int, int], ...] | None:
+    """Stat signature (path, mtime_ns, size) of the files pyright's verdict on roots depends on.
+
+    Each root is widened to its project (the directory of the nearest
+    pyproject.toml), since pyright's verdict on the requested files depends
+    on the modules they import. The snapshot covers the project's .py and
+    .pyi files, py.typed markers and config files, plus the site-packages
+    directories of its environment (so installs and upgrades count, though
+    edits made in place to installed files don't). Hidden directories,
+    __pycache__ and node_modules are skipped. Returns None once the walk has
+    visited more than MAX_SNAPSHOT_ENTRIES entries, since stat-ing a tree
+    that big costs more than the checks a snapshot would let callers skip.
+    """
+    from amplifier_bundle_python_dev.config import find_pyproject_toml
+
+    scan_roots = []
+    for root in roots:
+        resolved = Path(root).resolve()
+        pyproject = find_pyproject_toml(resolved)
+        scan_root = str(pyproject.parent if pyproject is not None else resolved)
+        if scan_root not in scan_roots:
+            scan_roots.append(scan_root)
+
+    entries = []
+    visited = 0
+    for scan_root in scan_roots:
+        for dirpath, dirnames, filenames in os.walk(scan_root):
+            visited += len(dirnames) + len(filenames)
+            if visited > MAX_SNAPSHOT_ENTRIES:
+                return None
+            dirnames[:] = [d for d in dirnames if not d.startswith(".") and d not in ("__pycache__", "node_modules")]
+            for name in filenames:
+                if not (name.endswith((".py", ".pyi")) or name == "py.typed" or name in CONFIG_FILE_NAMES):
+                    continue
+                candidate = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(candidate)
+                except OSError:
+                    continue
+                entries.append((candidate, st.st_mtime_ns, st.st_size))
+    for directory in _environment_dirs(scan_roots):
+        try:
+            st = os.stat(directory)
+        except OSError:
+            continue
+        entries.append((directory, st.st_mtime_ns, st.st_size))
+    return tuple(entries)
+
+
+@functools.lru_cache(maxsize=16)
+def _build_config(checks_key: frozenset[str] | None) -> CheckConfig | None:
+    """Build the config for a set of requested checks (None = defaults).
+
+    Cached because agents call the tool repeatedly with the same checks; the
+    returned config is shared, so it must not be mutated.
+    """
+    if not checks_key:
+        return None
+    return CheckConfig.from_dict(
+        {
+            "enable_ruff_format": "format" in checks_key,
+            "enable_ruff_lint": "lint" in checks_key,
+            "enable_pyright": "types" in checks_key,
+            "enable_stub_check": "stubs" in checks_key,
+        }
+    )
+
+
+def _project_digest() -> bytes | None:
+    """Digest of the snapshot of the project around the cwd (where content checks resolve imports).
+
+    None when the cwd isn't inside a project (there is no pyproject.toml to
+    bound the walk) or the project is too big to snapshot.
+    """
+    from amplifier_bundle_python_dev.config import find_pyproject_toml
+
+    cwd = Path.cwd()
+    if find_pyproject_toml(cwd) is None:
+        return None
+    snapshot = _snapshot_tree([cwd])
+    if snapshot is None:
+        return None
+    return hashlib.blake2b(repr(snapshot).encode("utf-8"), digest_size=16).digest()
+
+
+def _config_files_signature(start: Path) -> tuple[tuple[str, int, int], ...]:
+    """Stat signature of the config files in start and its parents (what ruff and load_config read)."""
+    entries = []
+    for directory in (start, *start.parents):
+        for name in CONFIG_FILE_NAMES:
+            candidate = os.path.join(directory, name)
+            try:
+                st = os.stat(candidate)
+            except OSError:
+                continue
+            entries.append((candidate, st.st_mtime_ns, st.st_size))
+    return tuple(entries)
+
+
+def _file_digest(path: str | Path) -> bytes | None:
+    """Hash a file's content (None if it can't be read)."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.blake2b(f.read(), digest_size=16).digest()
+    except OSError:
+        return None
+
+
+def _check_shard(paths: list[str | Path], config: CheckConfig | None, fix: bool) -> CheckResult:
+    """Check one shard of paths (module-level so worker processes can unpickle it)."""
+    from amplifier_bundle_python_dev import check_files
+
+    return check_files(paths, config=config, fix=fix)
 
 
 class PythonCheckTool:
     """Tool for checking Python code quality."""
 
+    def __init__(self):
+        # Worker pool for parallel checks, created on first use and reused across calls
+        self._executor: ProcessPoolExecutor | None = None
+
+        # Directory scan results keyed by (paths, checks), with the tree snapshot they were computed for
+        self._scan_cache: dict[tuple, tuple[tuple, CheckResult]] = {}
+
+        # Content check results keyed by (content hash, checks, project digest), oldest first
+        self._content_cache: dict[tuple, CheckResult] = {}
+
     @property
     def name(self) -> str:
         return "python_check"
@@ -28,6 +197,7 @@ Input options:
 - paths: List of file paths or directories to check
 - content: Python code as a string to check
 - fix: If true, auto-fix issues where possible (only works with paths)
+- jobs: Number of parallel worker processes to split multiple paths across
 
 Examples:
 - Check a file: {"paths": ["src/main.py"]}
@@ -35,6 +205,7 @@ Examples:
 - Check multiple paths: {"paths": ["src/", "tests/test_main.py"]}
 - Check code string: {"content": "def foo():\\n    pass"}
 - Auto-fix issues: {"paths": ["src/"], "fix": true}
+- Check paths in parallel: {"paths": ["src/", "tests/"], "jobs": 2}
 
 Returns:
 - success: True if no errors (warnings are OK)
@@ -61,6 +232,12 @@ Returns:
                     "description": "Auto-fix issues where possible",
                     "default": False,
                 },
+                "jobs": {
+                    "type": "integer",
+                    "description": "Parallel worker processes for multiple paths (default: 1)",
+                    "default": 1,
+                    "minimum": 1,
+                },
                 "checks": {
                     "type": "array",
                     "items": {"type": "string", "enum": ["format", "lint", "types", "stubs"]},
@@ -82,28 +259,177 @@ Returns:
         content = input_data.get("content")
         fix = input_data.get("fix", False)
         checks = input_data.get("checks")
+        jobs = input_data.get("jobs", 1)
 
         # Build config based on requested checks
-        config_overrides = {}
-        if checks:
-            config_overrides["enable_ruff_format"] = "format" in checks
-            config_overrides["enable_ruff_lint"] = "lint" in checks
-            config_overrides["enable_pyright"] = "types" in checks
-            config_overrides["enable_stub_check"] = "stubs" in checks
-
-        config = CheckConfig.from_dict(config_overrides) if config_overrides else None
+        checks_key = frozenset(checks) if checks else None
+        config = _build_config(checks_key)
 
         # Run checks
         if content:
-            result = check_content(content, config=config)
-        elif paths:
-            result = check_files(paths, config=config, fix=fix)
+            result = self._check_content(content, config, checks_key)
         else:
             # Default to current directory
-            result = check_files(["."], config=config, fix=fix)
+            result = await self._check_paths(paths or ["."], config, fix, jobs, checks_key)
 
         return ToolResult(success=result.success, output=result.to_tool_output())
 
+    def _check_content(self, content: str, config: CheckConfig | None, checks_key: frozenset | None) -> CheckResult:
+        """Check a code string, reusing the result for content that was already checked.
+
+        Results are keyed on what the checks read besides the content: the
+        whole project when pyright resolves the content's imports against it,
+        otherwise just the config files above the cwd. Outside a project (or
+        in one too big to snapshot) pyright results aren't cached.
+        """
+        from amplifier_bundle_python_dev import check_content
+        from amplifier_bundle_python_dev.config import load_config
+
+        cwd = Path.cwd()
+        if (config or load_config()).enable_pyright:
+            environment = _project_digest()
+            if environment is None:
+                return check_content(content, config=config)
+        else:
+            environment = _config_files_signature(cwd)
+
+        cache_key = (
+            hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest(),
+            checks_key,
+            str(cwd),
+            environment,
+        )
+        cached = self._content_cache.pop(cache_key, None)
+        if cached is None:
+            cached = check_content(content, config=config)
+            if len(self._content_cache) >= MAX_CACHED_CONTENT:
+                self._content_cache.pop(next(iter(self._content_cache)))
+        # (Re)insert as most recently used
+        self._content_cache[cache_key] = cached
+        return cached
+
+    async def _check_paths(
+        self, paths: list[str | Path], config: CheckConfig | None, fix: bool, jobs: int, checks_key: frozenset | None
+    ) -> CheckResult:
+        """Check paths, reusing the previous result for unchanged directory trees.
+
+        Directory scans are cached against a stat snapshot of the surrounding
+        project and its environment (see _snapshot_tree); any change re-runs
+        the full check, since type errors in one file can depend on edits to
+        another.
+        """
+        snapshot = None
+        cache_key = (tuple(paths), checks_key)
+        if not fix and all(os.path.isdir(p) for p in paths):
+            snapshot = _snapshot_tree(paths)
+            cached = self._scan_cache.get(cache_key)
+            if snapshot is not None and cached is not None and cached[0] == snapshot:
+                return cached[1]
+
+        if fix:
+            result = await self._fix_paths(paths, config, jobs)
+        else:
+            result = await self._run_checks(paths, config, False, jobs)
+
+        if snapshot is not None:
+            self._scan_cache.pop(cache_key, None)
+            if len(self._scan_cache) >= MAX_CACHED_SCANS:
+                self._scan_cache.pop(next(iter(self._scan_cache)))
+            self._scan_cache[cache_key] = (snapshot, result)
+        return result
+
+    async def _fix_paths(self, paths: list[str | Path], config: CheckConfig | None, jobs: int) -> CheckResult:
+        """Check first, then run the (much slower) fix pass only where it can help.
+
+        ruff's fix mode bypasses its cache, so it only runs on files that had
+        fixable issues in the plain check; other files keep their first results.
+        Only ruff fixes anything, so the fix pass skips pyright; pyright then
+        re-checks just the files ruff actually rewrote, since the first
+        results' line numbers no longer hold for them.
+        """
+        result = await self._run_checks(paths, config, False, jobs)
+
+        # Checkers report the same file as relative or absolute paths, so normalize
+        fixable_files: list[str | Path] = list(
+            dict.fromkeys(os.path.abspath(i.file) for i in result.issues if i.fixable and i.file)
+        )
+        if not fixable_files:
+            return result
+
+        from amplifier_bundle_python_dev.config import load_config
+
+        base_config = config or load_config()
+        digests = {path: _file_digest(path) for path in fixable_files}
+        fixed = await self._run_checks(
+            fixable_files, dataclasses.replace(base_config, enable_pyright=False), True, jobs
+        )
+
+        rewritten = [path for path in fixable_files if _file_digest(path) != digests[path]]
+        retyped: list[Issue] = []
+        if base_config.enable_pyright and rewritten:
+            pyright_only = dataclasses.replace(
+                base_config, enable_ruff_format=False, enable_ruff_lint=False, enable_stub_check=False
+            )
+            retyped = (await self._run_checks(rewritten, pyright_only, False, jobs)).issues
+
+        fixed_paths = set(fixable_files)
+        rewritten_paths = set(rewritten)
+        kept = []
+        for issue in result.issues:
+            path = os.path.abspath(issue.file) if issue.file else None
+            if path not in fixed_paths or (issue.source == "pyright" and path not in rewritten_paths):
+                kept.append(issue)
+        return CheckResult(
+            issues=kept + [i for i in chain(fixed.issues, retyped) if i.file],
+            files_checked=result.files_checked,
+            checks_run=result.checks_run,
+        )
+
+    async def _run_checks(
+        self, paths: list[str | Path], config: CheckConfig | None, fix: bool, jobs: int
+    ) -> CheckResult:
+        """Run check_files, split across worker processes when jobs > 1."""
+        if jobs > 1 and len(paths) > 1:
+            return await self._check_files_parallel(paths, config, fix, jobs)
+        return _check_shard(paths, config, fix)
+
+    async def _check_files_parallel(
+        self, paths: list[str | Path], config: CheckConfig | None, fix: bool, jobs: int
+    ) -> CheckResult:
+        """Split paths into shards and check them in worker processes.
+
+        Each shard is a single check_files() call, so ruff and pyright still
+        batch the paths within a shard.
+        """
+        if self._executor is None:
+            from amplifier_bundle_python_dev.checker import _process_context
+
+            # Tool calls run alongside the event loop's threads; don't fork them
+            self._executor = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=_process_context())
+
+        num_shards = min(jobs, len(paths))
+        shards = [paths[i::num_shards] for i in range(num_shards)]
+
+        loop = asyncio.get_running_loop()
+        shard_results = await asyncio.gather(
+            *(loop.run_in_executor(self._executor, _check_shard, shard, config, fix) for shard in shards)
+        )
+
+        checks_run: list[str] = []
+        for shard_result in shard_results:
+            checks_run.extend(c for c in shard_result.checks_run if c not in checks_run)
+        return CheckResult(
+            issues=[issue for shard_result in shard_results for issue in shard_result.issues],
+            files_checked=sum(shard_result.files_checked for shard_result in shard_results),
+            checks_run=checks_run,
+        )
+
+    def close(self) -> None:
+        """Shut down the worker pool if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
 
 async def mount(coordinator: Any, config: dict[str, Any] | None = None) -> dict[str, Any]:
     """Mount the python_check tool into the coordinator.
@@ -119,6 +445,7 @@ async def mount(coordinator: Any, config: dict[str, Any] | None = None) -> dict[
 
     # Register the tool
     await coordinator.mount("tools", tool, name=tool.name)
+    coordinator.register_cleanup(tool.close)
 
     return {
         "name": "tool-python-check",
@@ -6,8 +6,20 @@ Provides comprehensive Python development tools including:
 - Integration with Amplifier as tool and hook modules
 """
 
-from .checker import PythonChecker, check_files, check_content
-from .models import CheckResult, Issue, Severity, CheckConfig
+import importlib
+from typing import TYPE_CHECKING
+from typing import Any
+
+from .models import CheckConfig
+from .models import CheckResult
+from .models import Issue
+from .models import Severity
+
+if TYPE_CHECKING:
+    from .checker import PythonChecker
+    from .checker import check_content
+    from .checker import check_files
+    from .ruff_server import RuffServer
 
 __version__ = "0.1.0"
 
@@ -19,4 +31,23 @@ __all__ = [
     "Issue",
     "Severity",
     "CheckConfig",
+    "RuffServer",
 ]
+
+# Checker machinery (subprocess, config loading) is imported on first use so
+# that importing the models alone stays cheap
+_LAZY_IMPORTS = {
+    "PythonChecker": "checker",
+    "check_files": "checker",
+    "check_content": "checker",
+    "RuffServer": "ruff_server",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
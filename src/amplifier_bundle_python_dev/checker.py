@@ -6,22 +6,206 @@ This module contains all the checking logic, shared by:
 - Hook module (automatic checks on file events)
 """
 
-import json
+import atexit
+import bisect
+import contextlib
+import functools
+import multiprocessing
+import os
 import re
+import stat
 import subprocess
 import sys
+import threading
+from collections.abc import Callable
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
+from itertools import repeat
+from multiprocessing.context import BaseContext
 from pathlib import Path
+from typing import Any
 
 from .config import load_config
 from .models import CheckConfig, CheckResult, Issue, Severity
+from .ruff_server import RuffServer
+from .ruff_server import RuffServerError
+from .ruff_server import ruff_command
+from .ruff_server import shared_ruff_server
+
+# Lint and type-check JSON output can run to megabytes; decode it with a
+# compiled parser when one is installed (pip install amplifier-bundle-python-dev[fast])
+try:
+    from msgspec import DecodeError as JSONDecodeError  # type: ignore
+    from msgspec.json import decode as json_decode  # type: ignore
+except ImportError:
+    try:
+        from orjson import JSONDecodeError  # type: ignore
+        from orjson import loads as json_decode  # type: ignore
+    except ImportError:
+        from json import JSONDecodeError
+        from json import loads as json_decode
+
+# Exclude patterns are matched against every walked directory and file; an
+# Aho-Corasick automaton finds any of them in one pass over the path
+try:
+    import ahocorasick  # type: ignore
+except ImportError:
+    ahocorasick = None
+
+
+# A file `ruff format --check` would reformat: older ruff prints "Would reformat: <path>",
+# newer ruff (with --output-format=concise) prints "<path>:<row>:<col>: unformatted: ..."
+FORMAT_CHECK_LINE = re.compile(
+    r"^(?:Would reformat: (?P<path>.+)|(?P<concise_path>.+?):\d+:\d+: unformatted: .*)$", re.MULTILINE
+)
+
+# Ruff rule prefixes reported as errors (pycodestyle errors, pyflakes); the rest are warnings
+ERROR_CODE_PREFIXES = frozenset({"E", "F"})
+
+# Pyright severity names
+PYRIGHT_SEVERITIES = {
+    "error": Severity.ERROR,
+    "warning": Severity.WARNING,
+    "information": Severity.INFO,
+}
+
+# Decorators that make a bare `pass` body legitimate (click command groups)
+CLICK_MARKERS = ("@click.group", "@cli.group", "@click.command", "@cli.command")
+
+# Default stub patterns that ruff's flake8-fixme rules already report when enabled
+RUFF_COVERED_STUB_PATTERNS = {
+    r"\bFIXME\b": "FIX001",
+    r"\bTODO\b": "FIX002",
+    r"\bXXX\b": "FIX003",
+}
+RUFF_COVERED_CODES = frozenset(RUFF_COVERED_STUB_PATTERNS.values())
+
+# Stub-check across worker processes only above this many bytes of source
+# (the serial check runs at roughly 6 MB/s; starting the pool takes ~100ms)
+STUB_PARALLEL_MIN_BYTES = 1_000_000
+
+# Files per task handed to a stub-check worker
+STUB_SHARD_SIZE = 32
+
+# Fewer exclude patterns than this are cheaper to scan for one by one than through an automaton
+EXCLUDE_AUTOMATON_MIN_PATTERNS = 4
+
+
+def _iter_python_files(root: str, should_exclude: Callable[[str], bool]) -> Iterator[str]:
+    """Yield the paths of .py files under root.
+
+    Walks iteratively with os.walk (no recursion limit on deep trees).
+    Directories are pruned as soon as their path (with a trailing separator)
+    is excluded, so excluded trees like .venv are never walked. Symlinked
+    directories are not followed.
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        # Assigning to the slice is what stops os.walk from descending
+        dirnames[:] = [name for name in dirnames if not should_exclude(os.path.join(dirpath, name, ""))]
+        for name in filenames:
+            if name.endswith(".py"):
+                path = os.path.join(dirpath, name)
+                if not should_exclude(path):
+                    yield path
+
+
+def _candidate_lines(content: str, regex: re.Pattern[str]) -> Iterator[int]:
+    """Yield the (1-based) numbers of lines where regex matches, scanning the whole text at once.
+
+    A match can run across a line break (whitespace classes match newlines),
+    so callers must still check the line on its own.
+    """
+    line_starts: list[int] | None = None
+    pos = 0
+    while (match := regex.search(content, pos)) is not None:
+        if line_starts is None:
+            line_starts = [0, *(newline.end() for newline in re.finditer("\n", content))]
+        line_num = bisect.bisect_right(line_starts, match.start())
+        yield line_num
+        if line_num == len(line_starts):
+            return
+        # Resume at the start of the next line
+        pos = line_starts[line_num]
+
+
+def _stub_check_shard(config: CheckConfig, py_files: list[Path]) -> list[Issue]:
+    """Stub-check a shard of files (runs in a worker process)."""
+    checker = PythonChecker(config)
+    return list(chain.from_iterable(map(checker._check_file_for_stubs, py_files)))
+
+
+_stub_pool: ProcessPoolExecutor | None = None
+_stub_pool_lock = threading.Lock()
+
+
+def _shared_stub_pool() -> ProcessPoolExecutor:
+    """Return the process-wide stub-check worker pool, creating it on first use.
+
+    Workers are kept for later checks and shut down when the interpreter exits.
+    """
+    global _stub_pool
+    with _stub_pool_lock:
+        if _stub_pool is None:
+            _stub_pool = ProcessPoolExecutor(mp_context=_process_context())
+            atexit.register(_stub_pool.shutdown)
+        return _stub_pool
+
+
+def _discard_stub_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken stub-check pool so the next check starts a new one."""
+    global _stub_pool
+    with _stub_pool_lock:
+        if _stub_pool is pool:
+            _stub_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _total_size(paths: list[Path]) -> int:
+    """Sum of the sizes of paths, skipping any that can't be stat-ed."""
+    total = 0
+    for path in paths:
+        with contextlib.suppress(OSError):
+            total += os.stat(path).st_size
+    return total
+
+
+def _process_context() -> BaseContext | None:
+    """Start method for worker processes.
+
+    The stub check runs on a thread pool thread, and forking a threaded
+    process is unsafe; forkserver avoids that where it is available.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _ruff_format_has_output_format() -> bool:
+    """Whether the installed ruff accepts `ruff format --output-format` (newer releases)."""
+    try:
+        result = subprocess.run([*ruff_command(), "format", "--help"], capture_output=True, text=True)
+    except OSError:
+        return False
+    return "--output-format" in result.stdout
 
 
 class PythonChecker:
     """Main checker that orchestrates ruff, pyright, and stub detection."""
 
-    def __init__(self, config: CheckConfig | None = None):
-        """Initialize checker with optional config."""
+    def __init__(self, config: CheckConfig | None = None, ruff_server: RuffServer | None = None):
+        """Initialize checker with optional config.
+
+        Args:
+            config: Check configuration (defaults loaded from pyproject.toml)
+            ruff_server: Persistent ruff server to use for format/lint checks of
+                individual files instead of spawning ruff per check
+        """
         self.config = config or load_config()
+        self.ruff_server = ruff_server
 
     def check_files(self, paths: list[str | Path], fix: bool = False) -> CheckResult:
         """Run all enabled checks on the given paths.
@@ -37,29 +221,89 @@ class PythonChecker:
             paths = [Path.cwd()]
 
         path_strs = [str(p) for p in paths]
-        results = CheckResult(files_checked=self._count_python_files(path_strs))
+        # Walk the tree once; the stub check reuses the same file list
+        py_files = self._collect_python_files(path_strs)
+        results = CheckResult(files_checked=len(py_files))
 
-        if self.config.enable_ruff_format:
-            format_result = self._run_ruff_format(path_strs, fix=fix)
-            results = results.merge(format_result)
+        checks: list[Callable[[], CheckResult]] = []
+        if self.config.enable_ruff_format or self.config.enable_ruff_lint:
+            checks.append(lambda: self._run_ruff(path_strs, fix=fix))
+        if self.config.enable_pyright:
+            checks.append(lambda: self._run_pyright(path_strs))
+        if self.config.enable_stub_check:
+            checks.append(lambda: self._run_stub_check(py_files))
 
-        if self.config.enable_ruff_lint:
-            lint_result = self._run_ruff_lint(path_strs, fix=fix)
-            results = results.merge(lint_result)
+        if fix and checks and (self.config.enable_ruff_format or self.config.enable_ruff_lint):
+            # Fixes rewrite files, so finish them before anything else reads the files
+            results = results.merge(checks.pop(0)())
 
-        if self.config.enable_pyright:
-            type_result = self._run_pyright(path_strs)
-            results = results.merge(type_result)
+        return self._run_checks(results, checks)
 
-        if self.config.enable_stub_check:
-            stub_result = self._run_stub_check(path_strs)
-            results = results.merge(stub_result)
+    def _run_checks(self, results: CheckResult, checks: list[Callable[[], CheckResult]]) -> CheckResult:
+        """Run independent checks (concurrently if configured) and merge them into results."""
+        if self.config.parallel and len(checks) > 1:
+            # The checks are independent and mostly wait on subprocesses, so threads overlap them;
+            # results are merged in submission order to keep output stable
+            with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+                check_results = list(executor.map(lambda check: check(), checks))
+        else:
+            check_results = [check() for check in checks]
+
+        return self._drop_stubs_reported_by_ruff(CheckResult.merge_all([results, *check_results]))
+
+    def _drop_stubs_reported_by_ruff(self, result: CheckResult) -> CheckResult:
+        """Drop TODO/FIXME/XXX stub issues on lines ruff already reported.
 
+        With ruff's flake8-fixme rules enabled the same markers would be
+        reported twice. Going by ruff's actual results follows whatever
+        configuration ruff resolved for each file.
+        """
+        code_for = {
+            description: RUFF_COVERED_STUB_PATTERNS[pattern]
+            for pattern, description in self.config.stub_patterns
+            if pattern in RUFF_COVERED_STUB_PATTERNS
+        }
+        reported = {
+            (os.path.abspath(issue.file), issue.line, issue.code)
+            for issue in result.issues
+            if issue.source == "ruff-lint" and issue.code in RUFF_COVERED_CODES
+        }
+        if not code_for or not reported:
+            return result
+
+        result.issues = [
+            issue
+            for issue in result.issues
+            if issue.source != "stub-check"
+            or (os.path.abspath(issue.file), issue.line, code_for.get(issue.message.split(": ", 1)[0])) not in reported
+        ]
+        return result
+
+    def _run_ruff(self, paths: list[str], fix: bool = False, stdin: str | None = None) -> CheckResult:
+        """Run the enabled ruff checks (format, then lint).
+
+        Uses the persistent ruff server when available, falling back to the CLI.
+        When stdin is given it is checked as the content of the single path.
+        """
+        if self.ruff_server and not fix:
+            server_result = self._run_ruff_server(paths, stdin=stdin)
+            if server_result is not None:
+                return server_result
+
+        results = CheckResult()
+        if self.config.enable_ruff_format:
+            results = results.merge(self._run_ruff_format(paths, fix=fix, stdin=stdin))
+        if self.config.enable_ruff_lint:
+            results = results.merge(self._run_ruff_lint(paths, fix=fix, stdin=stdin))
         return results
 
     def check_content(self, content: str, filename: str = "stdin.py") -> CheckResult:
         """Check Python content string (useful for hook use).
 
+        Ruff and the stub check read the content directly. Only pyright needs
+        it on disk, in a temp file next to filename so imports resolve
+        against the surrounding project.
+
         Args:
             content: Python source code as string
             filename: Virtual filename for error reporting
@@ -67,44 +311,75 @@ class PythonChecker:
         Returns:
             CheckResult with issues found
         """
-        # Write to temp file and check
+        checks: list[Callable[[], CheckResult]] = []
+        if self.config.enable_ruff_format or self.config.enable_ruff_lint:
+            checks.append(lambda: self._run_ruff([filename], stdin=content))
+        if self.config.enable_pyright:
+            checks.append(lambda: self._run_pyright_content(content, filename))
+        if self.config.enable_stub_check:
+            checks.append(
+                lambda: CheckResult(
+                    issues=list(self._check_content_for_stubs(Path(filename), content)),
+                    checks_run=["stub-check"],
+                )
+            )
+
+        result = self._run_checks(CheckResult(files_checked=1), checks)
+        # Report everything against the given filename (tools resolve it to an absolute path)
+        for issue in result.issues:
+            if issue.file:
+                issue.file = filename
+        return result
+
+    def _run_pyright_content(self, content: str, filename: str) -> CheckResult:
+        """Run pyright on content via a temp file beside filename (system temp dir as fallback)."""
         import tempfile
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
+        parent = Path(filename).parent
+        directory = parent if os.access(parent, os.W_OK) else None
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".py", prefix="_python_check_", dir=directory, delete=False
+        ) as f:
             f.write(content)
             temp_path = f.name
 
         try:
-            result = self.check_files([temp_path])
-            # Rewrite paths to use the original filename
-            for issue in result.issues:
-                if issue.file == temp_path:
-                    issue.file = filename
-            return result
+            return self._run_pyright([temp_path])
         finally:
             Path(temp_path).unlink(missing_ok=True)
 
-    def _count_python_files(self, paths: list[str]) -> int:
-        """Count Python files in the given paths."""
-        count = 0
+    def _collect_python_files(self, paths: list[str]) -> list[Path]:
+        """Collect Python files in the given paths (explicit files plus non-excluded files in directories)."""
+        py_files = []
         for path_str in paths:
-            path = Path(path_str)
-            if path.is_file() and path.suffix == ".py":
-                count += 1
-            elif path.is_dir():
-                count += len(list(path.rglob("*.py")))
-        return count
-
-    def _run_ruff_format(self, paths: list[str], fix: bool = False) -> CheckResult:
-        """Run ruff format check."""
-        cmd = [sys.executable, "-m", "ruff", "format"]
-        if not fix:
-            cmd.append("--check")
-            cmd.append("--diff")
-        cmd.extend(paths)
+            # One stat per path (hooks pass many explicit files)
+            try:
+                mode = os.stat(path_str).st_mode
+            except (OSError, ValueError):
+                continue
+            if stat.S_ISREG(mode):
+                if os.path.splitext(path_str)[1] == ".py":
+                    py_files.append(Path(path_str))
+            elif stat.S_ISDIR(mode):
+                py_files.extend(map(Path, _iter_python_files(path_str, self._should_exclude)))
+        return py_files
+
+    def _run_ruff_format(self, paths: list[str], fix: bool = False, stdin: str | None = None) -> CheckResult:
+        """Run ruff format check (on stdin as the content of paths[0] if given)."""
+        cmd = [*ruff_command(), "format"]
+        if stdin is not None:
+            # The exit code alone says whether the content would be reformatted
+            cmd.extend(["--check", "--stdin-filename", paths[0], "-"])
+        else:
+            if not fix:
+                # List the files that would change rather than diffing them
+                cmd.append("--check")
+                if _ruff_format_has_output_format():
+                    cmd.append("--output-format=concise")
+            cmd.extend(paths)
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = subprocess.run(cmd, input=stdin, capture_output=True, text=True)
         except FileNotFoundError:
             return CheckResult(
                 issues=[
@@ -121,42 +396,50 @@ class PythonChecker:
                 checks_run=["ruff-format"],
             )
 
-        issues = []
-        if result.returncode != 0 and not fix:
-            # Parse diff output to find files that would be reformatted
-            current_file = None
-            for line in result.stdout.split("\n"):
-                if line.startswith("--- "):
-                    # Extract filename from diff header
-                    current_file = line[4:].strip()
-                    if current_file.startswith("a/"):
-                        current_file = current_file[2:]
-                elif line.startswith("+++ ") and current_file:
-                    issues.append(
-                        Issue(
-                            file=current_file,
-                            line=1,
-                            column=1,
-                            code="FORMAT",
-                            message="File would be reformatted",
-                            severity=Severity.WARNING,
-                            source="ruff-format",
-                            suggestion="Run with --fix to auto-format",
-                        )
-                    )
-                    current_file = None
+        unformatted = []
+        if stdin is not None:
+            if result.returncode == 1:
+                unformatted.append(paths[0])
+        elif result.returncode != 0 and not fix:
+            for match in FORMAT_CHECK_LINE.finditer(result.stdout):
+                unformatted.append(match["path"] or match["concise_path"])
+
+        issues = [
+            Issue(
+                file=path,
+                line=1,
+                column=1,
+                code="FORMAT",
+                message="File would be reformatted",
+                severity=Severity.WARNING,
+                source="ruff-format",
+                suggestion="Run with --fix to auto-format",
+                fixable=True,
+            )
+            for path in unformatted
+        ]
 
         return CheckResult(issues=issues, checks_run=["ruff-format"])
 
-    def _run_ruff_lint(self, paths: list[str], fix: bool = False) -> CheckResult:
-        """Run ruff lint check."""
-        cmd = [sys.executable, "-m", "ruff", "check", "--output-format=json"]
+    def _run_ruff_lint(self, paths: list[str], fix: bool = False, stdin: str | None = None) -> CheckResult:
+        """Run ruff lint check (on stdin as the content of paths[0] if given)."""
+        # One JSON object per line, so issues are parsed as ruff streams them
+        # rather than after buffering the whole report
+        cmd = [*ruff_command(), "check", "--output-format=json-lines"]
         if fix:
             cmd.append("--fix")
-        cmd.extend(paths)
+        if stdin is not None:
+            cmd.extend(["--stdin-filename", paths[0], "-"])
+        else:
+            cmd.extend(paths)
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE if stdin is not None else None,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
         except FileNotFoundError:
             return CheckResult(
                 issues=[
@@ -174,39 +457,120 @@ class PythonChecker:
             )
 
         issues = []
-        if result.stdout.strip():
-            try:
-                ruff_issues = json.loads(result.stdout)
-                for item in ruff_issues:
-                    # Determine severity from code
-                    code = item.get("code", "")
-                    if code.startswith("E") or code.startswith("F"):
-                        severity = Severity.ERROR
-                    else:
-                        severity = Severity.WARNING
-
-                    suggestion = None
-                    if item.get("fix"):
-                        suggestion = item["fix"].get("message", "Fix available")
+        with process:
+            if stdin is not None and process.stdin is not None:
+                # ruff reads all of stdin before it writes any output
+                process.stdin.write(stdin.encode("utf-8"))
+                process.stdin.close()
+            for raw_line in process.stdout or ():
+                if not raw_line.strip():
+                    continue
+                try:
+                    item = json_decode(raw_line)
+                except JSONDecodeError:
+                    continue
+
+                # Determine severity from code. Codes and file names repeat across
+                # thousands of issues, so intern them to share one string each.
+                code = sys.intern(item.get("code") or "")
+                severity = Severity.ERROR if code[:1] in ERROR_CODE_PREFIXES else Severity.WARNING
+
+                suggestion = None
+                if item.get("fix"):
+                    suggestion = item["fix"].get("message", "Fix available")
+
+                issues.append(
+                    Issue(
+                        file=sys.intern(item.get("filename", "")),
+                        line=item.get("location", {}).get("row", 0),
+                        column=item.get("location", {}).get("column", 0),
+                        code=code,
+                        message=item.get("message", ""),
+                        severity=severity,
+                        source="ruff-lint",
+                        suggestion=suggestion,
+                        end_line=item.get("end_location", {}).get("row"),
+                        end_column=item.get("end_location", {}).get("column"),
+                        fixable=item.get("fix") is not None,
+                    )
+                )
+
+        return CheckResult(issues=issues, checks_run=["ruff-lint"])
+
+    def _run_ruff_server(self, paths: list[str], stdin: str | None = None) -> CheckResult | None:
+        """Run ruff format/lint checks through the persistent ruff server.
+
+        Only handles explicit .py files inside the server's workspace, or stdin
+        as the content of the single path. Returns None when the server can't
+        be used, so the caller falls back to the ruff CLI.
+        """
+        if self.ruff_server is None:
+            return None
+        if stdin is None and not all(p.endswith(".py") and os.path.isfile(p) for p in paths):
+            return None
+        if not all(map(self.ruff_server.covers, paths)):
+            return None
+
+        run_format = self.config.enable_ruff_format
+        run_lint = self.config.enable_ruff_lint
+        issues = []
+        try:
+            for path in paths:
+                content = stdin if stdin is not None else Path(path).read_text(encoding="utf-8")
+                diagnostics, needs_format = self.ruff_server.check(path, content, lint=run_lint, format=run_format)
+
+                if needs_format:
+                    issues.append(
+                        Issue(
+                            file=path,
+                            line=1,
+                            column=1,
+                            code="FORMAT",
+                            message="File would be reformatted",
+                            severity=Severity.WARNING,
+                            source="ruff-format",
+                            suggestion="Run with --fix to auto-format",
+                            fixable=True,
+                        )
+                    )
+
+                abs_path = os.path.abspath(path)
+                for diag in diagnostics:
+                    code = sys.intern(diag.get("code") or "")
+                    severity = Severity.ERROR if code[:1] in ERROR_CODE_PREFIXES else Severity.WARNING
 
+                    # Fix details live in the diagnostic's data payload
+                    data = diag.get("data") or {}
+                    fixable = bool(data.get("edits"))
+                    suggestion = data.get("title", "Fix available") if fixable else None
+
+                    start = diag.get("range", {}).get("start", {})
+                    end = diag.get("range", {}).get("end", {})
                     issues.append(
                         Issue(
-                            file=item.get("filename", ""),
-                            line=item.get("location", {}).get("row", 0),
-                            column=item.get("location", {}).get("column", 0),
+                            file=abs_path,
+                            line=start.get("line", 0) + 1,
+                            column=start.get("character", 0) + 1,
                             code=code,
-                            message=item.get("message", ""),
+                            # Server messages carry an extra "help:" paragraph the CLI omits
+                            message=diag.get("message", "").split("\n\n", 1)[0],
                             severity=severity,
                             source="ruff-lint",
                             suggestion=suggestion,
-                            end_line=item.get("end_location", {}).get("row"),
-                            end_column=item.get("end_location", {}).get("column"),
+                            end_line=end.get("line", 0) + 1,
+                            end_column=end.get("character", 0) + 1,
+                            fixable=fixable,
                         )
                     )
-            except json.JSONDecodeError:
-                pass
+        except (OSError, UnicodeDecodeError, RuffServerError):
+            return None
 
-        return CheckResult(issues=issues, checks_run=["ruff-lint"])
+        checks_run = []
+        if run_format:
+            checks_run.append("ruff-format")
+        if run_lint:
+            checks_run.append("ruff-lint")
+        return CheckResult(issues=issues, checks_run=checks_run)
 
     def _run_pyright(self, paths: list[str]) -> CheckResult:
         """Run pyright type checking."""
@@ -214,7 +578,8 @@ class PythonChecker:
         cmd.extend(paths)
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            # Bytes output: the JSON decoder takes UTF-8 directly
+            result = subprocess.run(cmd, capture_output=True)
         except FileNotFoundError:
             return CheckResult(
                 issues=[
@@ -234,152 +599,218 @@ class PythonChecker:
         issues = []
         if result.stdout.strip():
             try:
-                pyright_output = json.loads(result.stdout)
+                pyright_output = json_decode(result.stdout)
                 for diag in pyright_output.get("generalDiagnostics", []):
-                    severity_map = {
-                        "error": Severity.ERROR,
-                        "warning": Severity.WARNING,
-                        "information": Severity.INFO,
-                    }
-                    severity = severity_map.get(diag.get("severity", "error"), Severity.ERROR)
+                    severity = PYRIGHT_SEVERITIES.get(diag.get("severity", "error"), Severity.ERROR)
+
+                    # Pyright always sends a full range; index it directly and only
+                    # fall back to per-field defaults if a part is missing
+                    try:
+                        diag_range = diag["range"]
+                        start = diag_range["start"]
+                        end = diag_range["end"]
+                        line, column = start["line"], start["character"]
+                        end_line, end_column = end["line"], end["character"]
+                    except KeyError:
+                        start = diag.get("range", {}).get("start", {})
+                        end = diag.get("range", {}).get("end", {})
+                        line, column = start.get("line", 0), start.get("character", 0)
+                        end_line, end_column = end.get("line", 0), end.get("character", 0)
 
                     issues.append(
                         Issue(
-                            file=diag.get("file", ""),
-                            line=diag.get("range", {}).get("start", {}).get("line", 0) + 1,
-                            column=diag.get("range", {}).get("start", {}).get("character", 0) + 1,
-                            code=diag.get("rule", "pyright"),
+                            file=sys.intern(diag.get("file", "")),
+                            line=line + 1,
+                            column=column + 1,
+                            code=sys.intern(diag.get("rule", "pyright")),
                             message=diag.get("message", ""),
                             severity=severity,
                             source="pyright",
-                            end_line=diag.get("range", {}).get("end", {}).get("line", 0) + 1,
-                            end_column=diag.get("range", {}).get("end", {}).get("character", 0) + 1,
+                            end_line=end_line + 1,
+                            end_column=end_column + 1,
                         )
                     )
-            except json.JSONDecodeError:
+            except JSONDecodeError:
                 pass
 
         return CheckResult(issues=issues, checks_run=["pyright"])
 
-    def _run_stub_check(self, paths: list[str]) -> CheckResult:
-        """Check for TODOs, stubs, and placeholder code."""
-        issues = []
-
-        for path_str in paths:
-            path = Path(path_str)
-            if path.is_file() and path.suffix == ".py":
-                issues.extend(self._check_file_for_stubs(path))
-            elif path.is_dir():
-                for py_file in path.rglob("*.py"):
-                    # Skip excluded patterns
-                    if self._should_exclude(py_file):
-                        continue
-                    issues.extend(self._check_file_for_stubs(py_file))
+    def _run_stub_check(self, py_files: list[Path]) -> CheckResult:
+        """Check for TODOs, stubs, and placeholder code.
 
+        Large file sets are split into shards and checked in a shared pool of
+        worker processes (the check is pure Python, so threads wouldn't help).
+        """
+        if (
+            self.config.stub_check_parallel
+            and len(py_files) > STUB_SHARD_SIZE
+            and (os.cpu_count() or 1) > 1
+            and _total_size(py_files) >= STUB_PARALLEL_MIN_BYTES
+        ):
+            shards = [py_files[i : i + STUB_SHARD_SIZE] for i in range(0, len(py_files), STUB_SHARD_SIZE)]
+            pool = None
+            try:
+                pool = _shared_stub_pool()
+                shard_issues = pool.map(_stub_check_shard, repeat(self.config), shards)
+                issues = list(chain.from_iterable(shard_issues))
+                return CheckResult(issues=issues, checks_run=["stub-check"])
+            except (OSError, BrokenProcessPool):
+                if pool is not None:
+                    _discard_stub_pool(pool)
+                # Fall back to checking in this process
+
+        issues = list(chain.from_iterable(map(self._check_file_for_stubs, py_files)))
         return CheckResult(issues=issues, checks_run=["stub-check"])
 
-    def _should_exclude(self, path: Path) -> bool:
+    def _should_exclude(self, path: str | Path) -> bool:
         """Check if path matches any exclude pattern."""
         path_str = str(path)
-        for pattern in self.config.exclude_patterns:
-            # Simple glob matching
-            if pattern.endswith("/**"):
-                dir_pattern = pattern[:-3]
-                if dir_pattern in path_str:
-                    return True
-            elif pattern in path_str:
-                return True
-        return False
+        automaton, substrings = self._exclude_matcher
+        if automaton is not None:
+            return next(automaton.iter(path_str), None) is not None
+        return any(substring in path_str for substring in substrings)
 
-    def _check_file_for_stubs(self, file_path: Path) -> list[Issue]:
-        """Check a single file for stub patterns."""
-        issues = []
+    @functools.cached_property
+    def _exclude_matcher(self) -> tuple[Any, tuple[str, ...]]:
+        """Substrings whose presence excludes a path, plus an automaton over them if worthwhile.
+
+        Exclude patterns use simple glob matching: "dir/**" excludes any path
+        containing "dir", anything else any path containing the pattern.
+        """
+        substrings = tuple(
+            pattern[:-3] if pattern.endswith("/**") else pattern for pattern in self.config.exclude_patterns
+        )
+        automaton = None
+        if ahocorasick is not None and len(substrings) >= EXCLUDE_AUTOMATON_MIN_PATTERNS:
+            automaton = ahocorasick.Automaton()
+            for substring in substrings:
+                automaton.add_word(substring, substring)
+            automaton.make_automaton()
+        return automaton, substrings
+
+    def _check_file_for_stubs(self, file_path: Path) -> Iterator[Issue]:
+        """Check a single file for stub patterns, yielding issues as they are found."""
+        # Test files are allowed to have mocks and stubs
+        if "test" in str(file_path).lower():
+            return
 
         try:
             content = file_path.read_text(encoding="utf-8")
-            lines = content.split("\n")
         except Exception:
-            return issues
+            return
+
+        yield from self._check_content_for_stubs(file_path, content)
 
-        for line_num, line in enumerate(lines, 1):
-            for pattern, description in self.config.stub_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
+    def _check_content_for_stubs(self, file_path: Path, content: str) -> Iterator[Issue]:
+        """Check the content of a file for stub patterns."""
+        # Test files are allowed to have mocks and stubs
+        if "test" in str(file_path).lower():
+            return
+
+        lines = content.split("\n")
+
+        # Protocol definitions are detected from the top of the file
+        header = "\n".join(lines[:50])
+
+        stub_regexes, prefilter, lower_prefilter = self.config.stub_regexes
+
+        # Most lines match no pattern; find the candidates with one scan of the whole file.
+        # Lowercasing only keeps offsets (and so line numbers) intact for ASCII text.
+        if lower_prefilter is not None and content.isascii():
+            line_nums = _candidate_lines(content.lower(), lower_prefilter)
+        elif prefilter is not None:
+            line_nums = _candidate_lines(content, prefilter)
+        else:
+            line_nums = range(1, len(lines) + 1)
+
+        for line_num in line_nums:
+            line = lines[line_num - 1]
+            for regex, description in stub_regexes:
+                if regex.search(line):
                     # Check for legitimate patterns
-                    if self._is_legitimate_pattern(file_path, line_num, line, lines):
+                    if self._is_legitimate_pattern(file_path, line_num, line, lines, header):
                         continue
 
-                    issues.append(
-                        Issue(
-                            file=str(file_path),
-                            line=line_num,
-                            column=1,
-                            code="STUB",
-                            message=f"{description}: {line.strip()[:60]}",
-                            severity=Severity.WARNING,
-                            source="stub-check",
-                            suggestion="Remove placeholder or implement functionality",
-                        )
+                    yield Issue(
+                        file=str(file_path),
+                        line=line_num,
+                        column=1,
+                        code="STUB",
+                        message=f"{description}: {line.strip()[:60]}",
+                        severity=Severity.WARNING,
+                        source="stub-check",
+                        suggestion="Remove placeholder or implement functionality",
                     )
 
-        return issues
+    def _is_legitimate_pattern(self, file_path: Path, line_num: int, line: str, lines: list[str], header: str) -> bool:
+        """Check if a stub pattern is actually legitimate.
 
-    def _is_legitimate_pattern(self, file_path: Path, line_num: int, line: str, lines: list[str]) -> bool:
-        """Check if a stub pattern is actually legitimate."""
-        # Test files are allowed to have mocks and stubs
-        if "test" in str(file_path).lower():
-            return True
+        Test files are skipped entirely by the caller. The header is the
+        first 50 lines of the file, joined once per file.
+        """
+        stripped = line.strip()
+
+        # Cheap checks on the line itself first, then the context windows
+        # (only for lines that could need them)
 
         # Empty __init__.py files are fine
-        if file_path.name == "__init__.py" and line.strip() in ("", "pass"):
+        if stripped in ("", "pass") and file_path.name == "__init__.py":
+            return True
+
+        # Protocol definitions with pass or ... are legitimate
+        if stripped in ("pass", "...") and "Protocol" in header:
             return True
 
         # Abstract methods with NotImplementedError are legitimate
         if "NotImplementedError" in line:
-            for i in range(max(0, line_num - 3), line_num):
-                if "@abstractmethod" in lines[i] or "@abc.abstractmethod" in lines[i]:
-                    return True
-
-        # Exception classes with just pass are legitimate
-        if line.strip() == "pass":
-            for i in range(max(0, line_num - 5), line_num):
-                if "class" in lines[i] and ("Error" in lines[i] or "Exception" in lines[i]):
-                    return True
+            window = "\n".join(lines[max(0, line_num - 3) : line_num])
+            if "@abstractmethod" in window or "@abc.abstractmethod" in window:
+                return True
 
-        # Click command groups with pass are legitimate
         if "pass" in line:
-            for i in range(max(0, line_num - 3), line_num):
-                if "@click.group" in lines[i] or "@cli.group" in lines[i]:
-                    return True
-                if "@click.command" in lines[i] or "@cli.command" in lines[i]:
-                    return True
+            # Exception classes with just pass are legitimate
+            if stripped == "pass" and any(
+                "class" in prev and ("Error" in prev or "Exception" in prev)
+                for prev in lines[max(0, line_num - 5) : line_num]
+            ):
+                return True
 
-        # Protocol definitions with pass or ... are legitimate
-        if line.strip() in ("pass", "..."):
-            if "Protocol" in "\n".join(lines[:50]):
+            # Click command groups with pass are legitimate
+            window = "\n".join(lines[max(0, line_num - 3) : line_num])
+            if any(marker in window for marker in CLICK_MARKERS):
                 return True
 
         return False
 
 
 # Convenience functions for direct use
-def check_files(paths: list[str | Path], config: CheckConfig | None = None, fix: bool = False) -> CheckResult:
+def check_files(
+    paths: list[str | Path],
+    config: CheckConfig | None = None,
+    fix: bool = False,
+    ruff_server: RuffServer | None = None,
+) -> CheckResult:
     """Check Python files for issues.
 
     Args:
         paths: Files or directories to check
         config: Optional config (defaults loaded from pyproject.toml)
         fix: If True, auto-fix issues where possible
+        ruff_server: Optional persistent ruff server for single-file checks
 
     Returns:
         CheckResult with issues found
     """
-    checker = PythonChecker(config)
+    checker = PythonChecker(config, ruff_server=ruff_server)
     return checker.check_files(paths, fix=fix)
 
 
 def check_content(content: str, filename: str = "stdin.py", config: CheckConfig | None = None) -> CheckResult:
     """Check Python content string.
 
+    Ruff checks go through the process-wide ruff server, so repeated calls
+    don't pay ruff's startup each time.
+
     Args:
         content: Python source code as string
         filename: Virtual filename for error reporting
@@ -388,5 +819,5 @@ def check_content(content: str, filename: str = "stdin.py", config: CheckConfig
     Returns:
         CheckResult with issues found
     """
-    checker = PythonChecker(config)
+    checker = PythonChecker(config, ruff_server=shared_ruff_server())
     return checker.check_content(content, filename)
@@ -1,5 +1,7 @@
 """Configuration loading for Python checks."""
 
+import copy
+import functools
 import os
 from pathlib import Path
 
@@ -15,8 +17,24 @@ except ImportError:
         tomllib = None  # type: ignore
 
 
+# Environment variables that override config values
+ENV_MAPPING = {
+    "AMPLIFIER_PYTHON_ENABLE_RUFF_FORMAT": "enable_ruff_format",
+    "AMPLIFIER_PYTHON_ENABLE_RUFF_LINT": "enable_ruff_lint",
+    "AMPLIFIER_PYTHON_ENABLE_PYRIGHT": "enable_pyright",
+    "AMPLIFIER_PYTHON_ENABLE_STUB_CHECK": "enable_stub_check",
+    "AMPLIFIER_PYTHON_FAIL_ON_WARNING": "fail_on_warning",
+    "AMPLIFIER_PYTHON_AUTO_FIX": "auto_fix",
+    "AMPLIFIER_PYTHON_PARALLEL": "parallel",
+}
+
+
 def find_pyproject_toml(start_path: Path | None = None) -> Path | None:
-    """Find pyproject.toml by walking up from start_path."""
+    """Find pyproject.toml by walking up from start_path.
+
+    Not memoized: confirming a remembered result would take the same stats
+    as the walk itself, since a pyproject.toml can appear below it at any time.
+    """
     current = start_path or Path.cwd()
 
     while current != current.parent:
@@ -40,6 +58,10 @@ def load_config(
     3. pyproject.toml [tool.amplifier-python-dev] section
     4. Default values
 
+    Without overrides the result is cached until pyproject.toml or the
+    environment variables change; each call gets its own copy, so callers
+    may adjust the returned config freely.
+
     Args:
         config_path: Explicit path to pyproject.toml (auto-discovered if None)
         overrides: Dict of config values to override
@@ -47,31 +69,42 @@ def load_config(
     Returns:
         Merged CheckConfig
     """
+    toml_path = (config_path or find_pyproject_toml()) if tomllib else None
+    mtime_ns = None
+    if toml_path:
+        try:
+            mtime_ns = toml_path.stat().st_mtime_ns
+        except OSError:
+            toml_path = None
+
+    env_values = tuple(os.environ.get(env_var) for env_var in ENV_MAPPING)
+
+    if overrides:
+        return _build_config(toml_path, env_values, overrides)
+    return copy.deepcopy(_load_config_cached(toml_path, mtime_ns, env_values))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(toml_path: Path | None, mtime_ns: int | None, env_values: tuple) -> CheckConfig:
+    """Build the config without overrides (mtime_ns only keys the cache so file edits invalidate it)."""
+    return _build_config(toml_path, env_values, None)
+
+
+def _build_config(toml_path: Path | None, env_values: tuple, overrides: dict | None) -> CheckConfig:
+    """Merge pyproject.toml settings, environment variable values and overrides into a CheckConfig."""
     config_data: dict = {}
 
     # Load from pyproject.toml
-    if tomllib:
-        toml_path = config_path or find_pyproject_toml()
-        if toml_path and toml_path.exists():
-            try:
-                with open(toml_path, "rb") as f:
-                    pyproject = tomllib.load(f)
-                    config_data = pyproject.get("tool", {}).get("amplifier-python-dev", {})
-            except Exception:
-                pass  # Graceful fallback to defaults
+    if toml_path and tomllib:
+        try:
+            with open(toml_path, "rb") as f:
+                pyproject = tomllib.load(f)
+                config_data = pyproject.get("tool", {}).get("amplifier-python-dev", {})
+        except Exception:
+            pass  # Graceful fallback to defaults
 
     # Apply environment variables
-    env_mapping = {
-        "AMPLIFIER_PYTHON_ENABLE_RUFF_FORMAT": "enable_ruff_format",
-        "AMPLIFIER_PYTHON_ENABLE_RUFF_LINT": "enable_ruff_lint",
-        "AMPLIFIER_PYTHON_ENABLE_PYRIGHT": "enable_pyright",
-        "AMPLIFIER_PYTHON_ENABLE_STUB_CHECK": "enable_stub_check",
-        "AMPLIFIER_PYTHON_FAIL_ON_WARNING": "fail_on_warning",
-        "AMPLIFIER_PYTHON_AUTO_FIX": "auto_fix",
-    }
-
-    for env_var, config_key in env_mapping.items():
-        value = os.environ.get(env_var)
+    for config_key, value in zip(ENV_MAPPING.values(), env_values, strict=True):
         if value is not None:
             # Parse boolean strings
             if value.lower() in ("true", "1", "yes"):
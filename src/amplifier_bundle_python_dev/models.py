@@ -1,10 +1,73 @@
 """Data models for Python checking results."""
 
+import contextlib
+import re
 from dataclasses import dataclass, field
 from enum import Enum
+from itertools import chain
+from itertools import groupby
+from itertools import islice
+from operator import attrgetter
 from pathlib import Path
 
 
+# Default CheckConfig filters and stub patterns (copied into a list per config)
+DEFAULT_EXCLUDE_PATTERNS = (
+    ".venv/**",
+    "__pycache__/**",
+    "*.egg-info/**",
+    ".git/**",
+    "node_modules/**",
+    "build/**",
+    "dist/**",
+)
+DEFAULT_INCLUDE_PATTERNS = ("**/*.py",)
+DEFAULT_STUB_PATTERNS = (
+    (r"\bTODO\b", "TODO comment"),
+    (r"\bFIXME\b", "FIXME comment"),
+    (r"\bXXX\b", "XXX marker"),
+    (r"raise\s+NotImplementedError\b", "NotImplementedError"),
+    (r'return\s+["\']not\s+implemented', "Not implemented return"),
+    (r"#.*coming\s+soon", "Coming soon comment"),
+)
+
+# Compiled stub patterns (with descriptions), a fused prefilter, and its lowercased variant
+StubRegexes = tuple[list[tuple[re.Pattern[str], str]], re.Pattern[str] | None, re.Pattern[str] | None]
+
+
+def _compile_stub_patterns(stub_patterns: list[tuple[str, str]]) -> StubRegexes:
+    """Compile stub patterns plus fused alternations of all of them.
+
+    The fused regex only finds candidate lines in the whole file; each
+    pattern is still checked on its own so a line matching several
+    patterns reports each one. Patterns with groups aren't fused, since
+    joining them would renumber any backreferences, and neither are
+    patterns anchored to the start or end of the whole text. If the joined
+    patterns don't compile (e.g. one starts with an inline global flag like
+    (?i), which is only allowed at the very start), there is no prefilter and
+    every line is checked.
+
+    When the patterns are plain ASCII, a lowercased case-sensitive copy
+    of the fused regex is also returned: scanning lowercased ASCII text
+    with it avoids the slower IGNORECASE matching. Patterns with
+    uppercase escapes (like \\S or \\W) can't be lowercased and don't get
+    one.
+    """
+    stub_regexes = [(re.compile(pattern, re.IGNORECASE), description) for pattern, description in stub_patterns]
+    prefilter = lower_prefilter = None
+    if stub_regexes and all(
+        regex.groups == 0 and "\\A" not in regex.pattern and "\\Z" not in regex.pattern for regex, _ in stub_regexes
+    ):
+        fused = "|".join(f"(?:{regex.pattern})" for regex, _ in stub_regexes)
+        with contextlib.suppress(re.error):
+            prefilter = re.compile(fused, re.IGNORECASE | re.MULTILINE)
+        if prefilter is not None and fused.isascii() and not re.search(r"\\[A-Z]", fused):
+            # Lowercasing can still break a pattern (e.g. a character range like [Z-a])
+            with contextlib.suppress(re.error):
+                lower_prefilter = re.compile(fused.lower(), re.MULTILINE)
+    return stub_regexes, prefilter, lower_prefilter
+
+
 class Severity(Enum):
     """Issue severity levels."""
 
@@ -13,7 +76,11 @@ class Severity(Enum):
     INFO = "info"
 
 
-@dataclass
+# One-letter severity markers for CLI output
+_SEV_ICON = {Severity.ERROR: "E", Severity.WARNING: "W", Severity.INFO: "I"}
+
+
+@dataclass(slots=True)
 class Issue:
     """A single issue found during checking."""
 
@@ -27,10 +94,11 @@ class Issue:
     suggestion: str | None = None
     end_line: int | None = None
     end_column: int | None = None
+    fixable: bool = False  # True if the checker can fix this automatically (fix=True)
 
     def to_dict(self) -> dict:
-        """Convert to dictionary for JSON serialization."""
-        return {
+        """Convert to dictionary for JSON serialization (suggestion only when there is one)."""
+        data = {
             "file": self.file,
             "line": self.line,
             "column": self.column,
@@ -38,8 +106,10 @@ class Issue:
             "message": self.message,
             "severity": self.severity.value,
             "source": self.source,
-            "suggestion": self.suggestion,
         }
+        if self.suggestion is not None:
+            data["suggestion"] = self.suggestion
+        return data
 
     def format_location(self) -> str:
         """Format as file:line:column."""
@@ -50,7 +120,7 @@ class Issue:
         return f"{self.format_location()}: [{self.code}] {self.message}"
 
 
-@dataclass
+@dataclass(slots=True)
 class CheckConfig:
     """Configuration for Python checks."""
 
@@ -61,34 +131,17 @@ class CheckConfig:
     enable_stub_check: bool = True
 
     # Filtering
-    exclude_patterns: list[str] = field(
-        default_factory=lambda: [
-            ".venv/**",
-            "__pycache__/**",
-            "*.egg-info/**",
-            ".git/**",
-            "node_modules/**",
-            "build/**",
-            "dist/**",
-        ]
-    )
-    include_patterns: list[str] = field(default_factory=lambda: ["**/*.py"])
+    exclude_patterns: list[str] = field(default_factory=lambda: list(DEFAULT_EXCLUDE_PATTERNS))
+    include_patterns: list[str] = field(default_factory=lambda: list(DEFAULT_INCLUDE_PATTERNS))
 
     # Behavior
     fail_on_warning: bool = False
     auto_fix: bool = False
+    parallel: bool = True  # Run independent checks concurrently
+    stub_check_parallel: bool = True  # Stub-check large file sets in worker processes
 
     # Stub check patterns
-    stub_patterns: list[tuple[str, str]] = field(
-        default_factory=lambda: [
-            (r"\bTODO\b", "TODO comment"),
-            (r"\bFIXME\b", "FIXME comment"),
-            (r"\bXXX\b", "XXX marker"),
-            (r"raise\s+NotImplementedError\b", "NotImplementedError"),
-            (r'return\s+["\']not\s+implemented', "Not implemented return"),
-            (r"#.*coming\s+soon", "Coming soon comment"),
-        ]
-    )
+    stub_patterns: list[tuple[str, str]] = field(default_factory=lambda: list(DEFAULT_STUB_PATTERNS))
 
     # Hook-specific
     hook_enabled: bool = True
@@ -96,6 +149,24 @@ class CheckConfig:
     hook_report_level: str = "warning"  # error | warning | info
     hook_auto_inject: bool = True
 
+    # Patterns the compiled regexes were built from, and the regexes themselves
+    _stub_compiled: tuple[tuple[tuple[str, str], ...], StubRegexes] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def stub_regexes(self) -> StubRegexes:
+        """Compiled stub_patterns (see _compile_stub_patterns), rebuilt whenever the patterns change.
+
+        Only raises for a pattern that doesn't compile on its own.
+        """
+        # Copied pairwise, since patterns loaded from TOML are lists that could be edited in place
+        patterns = tuple((pattern, description) for pattern, description in self.stub_patterns)
+        compiled = self._stub_compiled
+        if compiled is None or compiled[0] != patterns:
+            compiled = self._stub_compiled = (patterns, _compile_stub_patterns(self.stub_patterns))
+        return compiled[1]
+
     @classmethod
     def from_dict(cls, data: dict) -> "CheckConfig":
         """Create config from dictionary."""
@@ -104,10 +175,12 @@ class CheckConfig:
             enable_ruff_lint=data.get("enable_ruff_lint", True),
             enable_pyright=data.get("enable_pyright", True),
             enable_stub_check=data.get("enable_stub_check", True),
-            exclude_patterns=data.get("exclude_patterns", cls().exclude_patterns),
-            include_patterns=data.get("include_patterns", cls().include_patterns),
+            exclude_patterns=data.get("exclude_patterns", list(DEFAULT_EXCLUDE_PATTERNS)),
+            include_patterns=data.get("include_patterns", list(DEFAULT_INCLUDE_PATTERNS)),
             fail_on_warning=data.get("fail_on_warning", False),
             auto_fix=data.get("auto_fix", False),
+            parallel=data.get("parallel", True),
+            stub_check_parallel=data.get("stub_check_parallel", True),
             hook_enabled=data.get("hook", {}).get("enabled", True),
             hook_file_patterns=data.get("hook", {}).get("file_patterns", ["*.py"]),
             hook_report_level=data.get("hook", {}).get("report_level", "warning"),
@@ -115,7 +188,7 @@ class CheckConfig:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CheckResult:
     """Result of running Python checks."""
 
@@ -123,27 +196,44 @@ class CheckResult:
     files_checked: int = 0
     checks_run: list[str] = field(default_factory=list)
 
+    def _counts(self) -> tuple[int, int, int]:
+        """Error, warning and info counts, tallied in one pass over the issues.
+
+        Not cached: issues is a public list that callers edit in place.
+        """
+        errors = warnings = infos = 0
+        for issue in self.issues:
+            severity = issue.severity
+            if severity is Severity.ERROR:
+                errors += 1
+            elif severity is Severity.WARNING:
+                warnings += 1
+            else:
+                infos += 1
+        return errors, warnings, infos
+
     @property
     def error_count(self) -> int:
         """Count of error-severity issues."""
-        return sum(1 for i in self.issues if i.severity == Severity.ERROR)
+        return sum(1 for i in self.issues if i.severity is Severity.ERROR)
 
     @property
     def warning_count(self) -> int:
         """Count of warning-severity issues."""
-        return sum(1 for i in self.issues if i.severity == Severity.WARNING)
+        return sum(1 for i in self.issues if i.severity is Severity.WARNING)
 
     @property
     def info_count(self) -> int:
         """Count of info-severity issues."""
-        return sum(1 for i in self.issues if i.severity == Severity.INFO)
+        return sum(1 for i in self.issues if i.severity is Severity.INFO)
 
     @property
     def exit_code(self) -> int:
         """Exit code: 0=clean, 1=warnings only, 2=errors."""
-        if self.error_count > 0:
+        errors, warnings, _ = self._counts()
+        if errors > 0:
             return 2
-        if self.warning_count > 0:
+        if warnings > 0:
             return 1
         return 0
 
@@ -163,46 +253,45 @@ class CheckResult:
         if self.clean:
             return f"All checks passed ({self.files_checked} files)"
 
+        errors, warnings, infos = self._counts()
         parts = []
-        if self.error_count:
-            parts.append(f"{self.error_count} error{'s' if self.error_count != 1 else ''}")
-        if self.warning_count:
-            parts.append(f"{self.warning_count} warning{'s' if self.warning_count != 1 else ''}")
-        if self.info_count:
-            parts.append(f"{self.info_count} info")
+        if errors:
+            parts.append(f"{errors} error{'s' if errors != 1 else ''}")
+        if warnings:
+            parts.append(f"{warnings} warning{'s' if warnings != 1 else ''}")
+        if infos:
+            parts.append(f"{infos} info")
 
         return f"Found {', '.join(parts)} in {self.files_checked} files"
 
     def to_cli_output(self) -> str:
         """Format for CLI display."""
-        lines = []
-
-        # Group by file
-        by_file: dict[str, list[Issue]] = {}
-        for issue in self.issues:
-            by_file.setdefault(issue.file, []).append(issue)
-
-        for file_path, file_issues in sorted(by_file.items()):
-            lines.append(f"\n{file_path}")
-            for issue in sorted(file_issues, key=lambda i: (i.line, i.column)):
-                severity_icon = {"error": "E", "warning": "W", "info": "I"}[issue.severity.value]
-                lines.append(f"  {issue.line}:{issue.column} [{severity_icon}] {issue.code}: {issue.message}")
+        lines: list[str] = []
+        append = lines.append
+
+        # One sort orders files and the issues within them; then group by file
+        issues = sorted(self.issues, key=attrgetter("file", "line", "column"))
+        for file_path, file_issues in groupby(issues, key=attrgetter("file")):
+            append(f"\n{file_path}")
+            for issue in file_issues:
+                append(f"  {issue.line}:{issue.column} [{_SEV_ICON[issue.severity]}] {issue.code}: {issue.message}")
                 if issue.suggestion:
-                    lines.append(f"         -> {issue.suggestion}")
+                    append(f"         -> {issue.suggestion}")
 
-        lines.append(f"\n{self.summary}")
+        append(f"\n{self.summary}")
         return "\n".join(lines)
 
     def to_tool_output(self) -> dict:
         """Format for Amplifier tool response."""
+        errors, warnings, _ = self._counts()
         return {
-            "success": self.success,
+            "success": errors == 0,
             "clean": self.clean,
             "summary": self.summary,
             "files_checked": self.files_checked,
             "checks_run": self.checks_run,
-            "error_count": self.error_count,
-            "warning_count": self.warning_count,
+            "error_count": errors,
+            "warning_count": warnings,
             "issues": [i.to_dict() for i in self.issues],
         }
 
@@ -211,19 +300,18 @@ class CheckResult:
         if self.clean:
             return {}
 
-        # Format issues for agent context
-        issue_lines = []
-        for issue in self.issues[:10]:  # Limit to first 10
-            issue_lines.append(f"- {issue.format_short()}")
+        # Format issues for agent context, limited to the first 10
+        issue_lines = [f"- {issue.format_short()}" for issue in islice(self.issues, 10)]
 
         if len(self.issues) > 10:
             issue_lines.append(f"  ... and {len(self.issues) - 10} more issues")
 
+        errors, warnings, _ = self._counts()
         return {
             "summary": self.summary,
             "issues_text": "\n".join(issue_lines),
-            "error_count": self.error_count,
-            "warning_count": self.warning_count,
+            "error_count": errors,
+            "warning_count": warnings,
         }
 
     def merge(self, other: "CheckResult") -> "CheckResult":
@@ -231,5 +319,17 @@ class CheckResult:
         return CheckResult(
             issues=self.issues + other.issues,
             files_checked=max(self.files_checked, other.files_checked),
-            checks_run=list(set(self.checks_run + other.checks_run)),
+            checks_run=list(dict.fromkeys(chain(self.checks_run, other.checks_run))),
+        )
+
+    @classmethod
+    def merge_all(cls, results: "list[CheckResult]") -> "CheckResult":
+        """Merge several results at once (same as chained merge(), without the pairwise list copies)."""
+        issues: list[Issue] = []
+        for result in results:
+            issues.extend(result.issues)
+        return cls(
+            issues=issues,
+            files_checked=max((result.files_checked for result in results), default=0),
+            checks_run=list(dict.fromkeys(chain.from_iterable(result.checks_run for result in results))),
         )
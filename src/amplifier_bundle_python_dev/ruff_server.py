@@ -0,0 +1,285 @@
+"""Persistent ruff language server client.
+
+Spawning ruff for every check pays process startup each time. Callers that
+check single files over and over (like the hook module) can keep one
+`ruff server` process alive instead and ask it for lint diagnostics and
+formatting over LSP (JSON-RPC on stdin/stdout).
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import IO
+from typing import Any
+
+# Formatting options are required by LSP but ruff takes them from its own config
+_FORMATTING_OPTIONS = {"tabSize": 4, "insertSpaces": True}
+
+# Seconds to wait for the server to answer a request before giving up on the process
+DEFAULT_TIMEOUT = 10.0
+
+# Process-wide server shared by callers that don't manage their own
+_shared_server: "RuffServer | None" = None
+_shared_server_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def ruff_command() -> tuple[str, ...]:
+    """Command prefix for running ruff.
+
+    Prefers the ruff binary installed alongside this interpreter (what
+    `python -m ruff` would exec) so each run skips a Python startup, then a
+    ruff on PATH, then `python -m ruff` itself.
+    """
+    try:
+        from ruff import find_ruff_bin
+
+        return (find_ruff_bin(),)
+    except (ImportError, FileNotFoundError):
+        pass
+    ruff = shutil.which("ruff")
+    if ruff is not None:
+        return (ruff,)
+    return (sys.executable, "-m", "ruff")
+
+
+def shared_ruff_server() -> "RuffServer":
+    """Return the process-wide ruff server, creating it on first use.
+
+    The server process itself starts lazily on the first check and is shut
+    down when the interpreter exits.
+    """
+    global _shared_server
+    with _shared_server_lock:
+        if _shared_server is None:
+            _shared_server = RuffServer()
+            atexit.register(_shared_server.close)
+        return _shared_server
+
+
+def _read_messages(stream: IO[bytes], messages: "queue.Queue[dict | None]") -> None:
+    """Read framed JSON-RPC messages from the server into a queue (runs on a reader thread).
+
+    None is queued when the stream ends or a message can't be parsed.
+    """
+    try:
+        while True:
+            length = None
+            while True:
+                line = stream.readline()
+                if not line:
+                    return
+                if line == b"\r\n":
+                    break
+                name, _, value = line.decode("ascii").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            if length is None:
+                return
+            messages.put(json.loads(stream.read(length)))
+    except (OSError, ValueError):
+        pass
+    finally:
+        messages.put(None)
+
+
+class RuffServerError(Exception):
+    """The ruff server could not be started or stopped responding."""
+
+
+class RuffServer:
+    """Client for a long-lived `ruff server` process.
+
+    The process is started lazily on first use and shared by all callers;
+    requests are serialized with a lock so the client is thread-safe. A
+    server that doesn't answer within the timeout is killed (the next check
+    starts a new one) so callers can fall back to the ruff CLI.
+    """
+
+    def __init__(self, root: Path | None = None, timeout: float = DEFAULT_TIMEOUT):
+        """Initialize client for the given workspace root (falls back to cwd).
+
+        Args:
+            root: Workspace root the server resolves settings against
+            timeout: Seconds to wait for each response before killing the server
+        """
+        self.root = root or Path.cwd()
+        self.timeout = timeout
+        self._resolved_root = self.root.resolve()
+        self._process: subprocess.Popen[bytes] | None = None
+        self._messages: queue.Queue[dict | None] = queue.Queue()
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def covers(self, path: str) -> bool:
+        """Whether path lies under the workspace root.
+
+        The server resolves settings only for files in its workspace; files
+        outside it would be checked with ruff's defaults instead of their
+        project's configuration.
+        """
+        return Path(path).resolve().is_relative_to(self._resolved_root)
+
+    def check(self, path: str, content: str, lint: bool = True, format: bool = True) -> tuple[list[dict], bool]:
+        """Lint and/or format-check a document.
+
+        Args:
+            path: File path the content belongs to (used for config resolution)
+            content: Python source code
+            lint: Whether to collect lint diagnostics
+            format: Whether to check if the file would be reformatted
+
+        Returns:
+            Tuple of (raw LSP diagnostics, whether the file would be reformatted)
+
+        Raises:
+            RuffServerError: If the server is unavailable or returns an error
+        """
+        uri = Path(path).resolve().as_uri()
+        with self._lock:
+            self._ensure_started()
+            self._notify(
+                "textDocument/didOpen",
+                {"textDocument": {"uri": uri, "languageId": "python", "version": 1, "text": content}},
+            )
+            try:
+                diagnostics: list[dict] = []
+                if lint:
+                    report = self._request("textDocument/diagnostic", {"textDocument": {"uri": uri}})
+                    diagnostics = (report or {}).get("items", [])
+                needs_format = False
+                if format:
+                    edits = self._request(
+                        "textDocument/formatting",
+                        {"textDocument": {"uri": uri}, "options": _FORMATTING_OPTIONS},
+                    )
+                    needs_format = bool(edits)
+            finally:
+                # A server that failed mid-request has already been discarded
+                if self._process is not None:
+                    self._notify("textDocument/didClose", {"textDocument": {"uri": uri}})
+        return diagnostics, needs_format
+
+    def close(self) -> None:
+        """Shut down the server process if it is running."""
+        with self._lock:
+            process, self._process = self._process, None
+            if process is None:
+                return
+            try:
+                self._send(process, {"jsonrpc": "2.0", "method": "exit"})
+                process.wait(timeout=2)
+            except (OSError, RuffServerError, subprocess.TimeoutExpired):
+                process.kill()
+
+    def _ensure_started(self) -> None:
+        """Start the server and perform the LSP handshake if needed."""
+        if self._process is not None and self._process.poll() is None:
+            return
+
+        self._discard()
+        try:
+            self._process = subprocess.Popen(
+                [*ruff_command(), "server"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            self._process = None
+            raise RuffServerError(f"Failed to start ruff server: {e}") from e
+
+        # Responses are read on a separate thread so waiting for one can time out
+        self._messages = queue.Queue()
+        threading.Thread(
+            target=_read_messages, args=(self._process.stdout, self._messages), name="ruff-server-reader", daemon=True
+        ).start()
+
+        root_uri = self.root.resolve().as_uri()
+        try:
+            self._request(
+                "initialize",
+                {
+                    "processId": None,
+                    "rootUri": root_uri,
+                    "workspaceFolders": [{"uri": root_uri, "name": self.root.name}],
+                    "capabilities": {},
+                },
+            )
+            self._notify("initialized", {})
+        except RuffServerError:
+            # Don't leave a half-initialized server behind for the next call
+            self._discard()
+            raise
+
+    def _discard(self) -> None:
+        """Kill the server process (if any) so the next check starts a fresh one."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        with contextlib.suppress(OSError):
+            process.kill()
+        with contextlib.suppress(subprocess.TimeoutExpired):
+            process.wait(timeout=2)
+
+    def _request(self, method: str, params: dict) -> Any:
+        """Send a request and wait for its response, skipping unrelated messages."""
+        process = self._require_process()
+        self._next_id += 1
+        request_id = self._next_id
+        self._send(process, {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            message = self._receive(method, deadline)
+            if "method" in message:
+                # Server-to-client requests need an answer; notifications are ignored
+                if "id" in message:
+                    self._send(process, {"jsonrpc": "2.0", "id": message["id"], "result": None})
+                continue
+            if message.get("id") != request_id:
+                continue
+            if "error" in message:
+                raise RuffServerError(f"ruff server error for {method}: {message['error'].get('message', '')}")
+            return message.get("result")
+
+    def _notify(self, method: str, params: dict) -> None:
+        """Send a notification (no response expected)."""
+        self._send(self._require_process(), {"jsonrpc": "2.0", "method": method, "params": params})
+
+    def _require_process(self) -> subprocess.Popen[bytes]:
+        if self._process is None:
+            raise RuffServerError("ruff server is not running")
+        return self._process
+
+    def _send(self, process: subprocess.Popen[bytes], message: dict) -> None:
+        """Write one framed JSON-RPC message to the server."""
+        body = json.dumps(message).encode("utf-8")
+        if process.stdin is None:
+            raise RuffServerError("ruff server has no stdin pipe")
+        try:
+            process.stdin.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+            process.stdin.flush()
+        except (OSError, ValueError) as e:
+            self._discard()
+            raise RuffServerError(f"ruff server closed its input: {e}") from e
+
+    def _receive(self, method: str, deadline: float) -> dict:
+        """Wait for the next message from the server, discarding the server at the deadline."""
+        try:
+            message = self._messages.get(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            self._discard()
+            raise RuffServerError(f"ruff server did not answer {method} within {self.timeout}s") from None
+        if message is None:
+            self._discard()
+            raise RuffServerError("ruff server exited or sent a malformed message")
+        return message
@@ -0,0 +1,9 @@
+"""Make the Amplifier modules importable without installing them."""
+
+import sys
+from pathlib import Path
+
+MODULES = Path(__file__).parent.parent / "modules"
+
+for module_dir in ("hooks-python-check", "tool-python-check"):
+    sys.path.insert(0, str(MODULES / module_dir))
@@ -1,12 +1,59 @@
 """Validate python-dev bundle composition after lsp-python absorption."""
 
+import functools
+import os
 from pathlib import Path
 
 import yaml
 
+# LibYAML's C loader when PyYAML was built with it; same results, much faster
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 ROOT = Path(__file__).parent.parent
 
 
+def _safe_load(text: str):
+    return yaml.load(text, Loader=SafeLoader)
+
+
+@functools.cache
+def _read_text(path: str) -> str:
+    """Read a file relative to the bundle root (files don't change during a test run)."""
+    return (ROOT / path).read_text()
+
+
+@functools.cache
+def _load_yaml(path: str) -> dict:
+    """Parse a YAML file relative to the bundle root. Callers must not mutate the result."""
+    return _safe_load(_read_text(path))
+
+
+@functools.cache
+def _agent(path: str) -> tuple[str, dict | None]:
+    """Agent markdown relative to the bundle root, with its parsed frontmatter (None if it has none)."""
+    content = _read_text(path)
+    parts = content.split("---", 2)
+    meta = _safe_load(parts[1]) if len(parts) >= 3 else None
+    return content, meta
+
+
+def _iter_yaml(root: Path):
+    """Yield YAML files under root, pruning hidden and node_modules directories before descending."""
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or entry.name == "node_modules":
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".yaml"):
+                    yield entry.path
+
+
 def deep_merge(base, overlay):
     result = base.copy()
     for key, value in overlay.items():
@@ -22,7 +69,7 @@ def deep_merge(base, overlay):
 
 def test_bundle_metadata():
     """Root bundle has required metadata and correct version."""
-    bundle = yaml.safe_load((ROOT / "bundle.yaml").read_text())
+    bundle = _load_yaml("bundle.yaml")
     assert bundle["bundle"]["name"] == "python-dev"
     assert "version" in bundle["bundle"]
     assert "description" in bundle["bundle"]
@@ -30,14 +77,14 @@ def test_bundle_metadata():
 
 def test_bundle_no_lsp_python_reference():
     """bundle.yaml must not reference the old lsp-python bundle."""
-    content = (ROOT / "bundle.yaml").read_text()
+    content = _read_text("bundle.yaml")
     assert "lsp-python" not in content, "bundle.yaml still references lsp-python — should use internal behaviors"
     assert "amplifier-bundle-lsp-python" not in content
 
 
 def test_bundle_uses_internal_composite():
     """bundle.yaml includes the internal composite behavior."""
-    bundle = yaml.safe_load((ROOT / "bundle.yaml").read_text())
+    bundle = _load_yaml("bundle.yaml")
     includes = bundle["includes"]
     assert len(includes) == 1
     assert includes[0]["bundle"] == "python-dev:behaviors/python-dev"
@@ -48,7 +95,7 @@ def test_bundle_uses_internal_composite():
 
 def test_composite_behavior_includes_both():
     """Composite python-dev.yaml includes both LSP and quality behaviors."""
-    behavior = yaml.safe_load((ROOT / "behaviors" / "python-dev.yaml").read_text())
+    behavior = _load_yaml("behaviors/python-dev.yaml")
     includes = behavior["includes"]
     bundles = [i["bundle"] for i in includes]
     assert "python-dev:behaviors/python-lsp" in bundles
@@ -57,14 +104,14 @@ def test_composite_behavior_includes_both():
 
 def test_composite_behavior_has_no_direct_tools():
     """Composite behavior should only include sub-behaviors, not define tools."""
-    behavior = yaml.safe_load((ROOT / "behaviors" / "python-dev.yaml").read_text())
+    behavior = _load_yaml("behaviors/python-dev.yaml")
     assert "tools" not in behavior, "Composite should not define tools directly"
     assert "hooks" not in behavior, "Composite should not define hooks directly"
 
 
 def test_quality_behavior_has_tools_and_hooks():
     """Quality behavior defines tool-python-check and hooks-python-check."""
-    behavior = yaml.safe_load((ROOT / "behaviors" / "python-quality.yaml").read_text())
+    behavior = _load_yaml("behaviors/python-quality.yaml")
     assert behavior["bundle"]["name"] == "python-quality-behavior"
     tool_modules = [t["module"] for t in behavior["tools"]]
     assert "tool-python-check" in tool_modules
@@ -74,21 +121,21 @@ def test_quality_behavior_has_tools_and_hooks():
 
 def test_quality_behavior_registers_python_dev_agent():
     """Quality behavior registers the python-dev agent."""
-    behavior = yaml.safe_load((ROOT / "behaviors" / "python-quality.yaml").read_text())
+    behavior = _load_yaml("behaviors/python-quality.yaml")
     agents = behavior["agents"]["include"]
     assert "python-dev:python-dev" in agents
 
 
 def test_lsp_behavior_registers_code_intel_agent():
     """LSP behavior registers the code-intel agent."""
-    behavior = yaml.safe_load((ROOT / "behaviors" / "python-lsp.yaml").read_text())
+    behavior = _load_yaml("behaviors/python-lsp.yaml")
     agents = behavior["agents"]["include"]
     assert "python-dev:code-intel" in agents
 
 
 def test_lsp_behavior_includes_lsp_core():
     """LSP behavior includes the base lsp-core behavior."""
-    behavior = yaml.safe_load((ROOT / "behaviors" / "python-lsp.yaml").read_text())
+    behavior = _load_yaml("behaviors/python-lsp.yaml")
     includes = behavior["includes"]
     assert any("lsp-core" in i["bundle"] for i in includes)
 
@@ -98,7 +145,7 @@ def test_lsp_behavior_includes_lsp_core():
 
 def test_python_config_merges():
     """Python language config merges into lsp-core's empty languages slot."""
-    behavior = yaml.safe_load((ROOT / "behaviors" / "python-lsp.yaml").read_text())
+    behavior = _load_yaml("behaviors/python-lsp.yaml")
     python_config = next(t["config"] for t in behavior["tools"] if t["module"] == "tool-lsp")
     core_config = {"languages": {}, "timeout_seconds": 30}
     merged = deep_merge(core_config, python_config)
@@ -113,7 +160,7 @@ def test_python_config_merges():
 
 def test_python_server_config_complete():
     """Python server config has all required fields."""
-    behavior = yaml.safe_load((ROOT / "behaviors" / "python-lsp.yaml").read_text())
+    behavior = _load_yaml("behaviors/python-lsp.yaml")
     python = next(t["config"] for t in behavior["tools"] if t["module"] == "tool-lsp")["languages"]["python"]
     assert "extensions" in python
     assert "workspace_markers" in python
@@ -125,7 +172,7 @@ def test_python_server_config_complete():
 
 def test_python_capabilities_declared():
     """Python bundle declares capabilities matching live Pyright test results."""
-    behavior = yaml.safe_load((ROOT / "behaviors" / "python-lsp.yaml").read_text())
+    behavior = _load_yaml("behaviors/python-lsp.yaml")
     caps = next(t["config"] for t in behavior["tools"] if t["module"] == "tool-lsp")["languages"]["python"][
         "capabilities"
     ]
@@ -145,14 +192,14 @@ def test_python_capabilities_declared():
 def test_no_lsp_python_namespace_in_behaviors():
     """No behavior file should reference the old lsp-python: namespace."""
     for yaml_file in (ROOT / "behaviors").glob("*.yaml"):
-        content = yaml_file.read_text()
+        content = _read_text(yaml_file.relative_to(ROOT).as_posix())
         assert "lsp-python:" not in content, f"{yaml_file.name} still references lsp-python: namespace"
 
 
 def test_no_lsp_python_namespace_in_agents():
     """No agent file should reference the old lsp-python: namespace."""
     for md_file in (ROOT / "agents").glob("*.md"):
-        content = md_file.read_text()
+        content = _read_text(md_file.relative_to(ROOT).as_posix())
         # Check frontmatter only (between first two --- markers)
         parts = content.split("---", 2)
         if len(parts) >= 3:
@@ -165,10 +212,8 @@ def test_no_lsp_python_namespace_in_agents():
 
 def test_code_intel_agent_frontmatter():
     """code-intel agent has proper meta frontmatter."""
-    content = (ROOT / "agents" / "code-intel.md").read_text()
-    parts = content.split("---", 2)
-    assert len(parts) >= 3, "Agent must have YAML frontmatter between --- markers"
-    meta = yaml.safe_load(parts[1])
+    _, meta = _agent("agents/code-intel.md")
+    assert meta is not None, "Agent must have YAML frontmatter between --- markers"
     assert meta["meta"]["name"] == "code-intel"
     assert "description" in meta["meta"]
     # Agent must declare tools for sub-session independence
@@ -178,9 +223,8 @@ def test_code_intel_agent_frontmatter():
 
 def test_code_intel_description_uses_new_namespace():
     """code-intel description references python-dev:code-intel, not python-code-intel."""
-    content = (ROOT / "agents" / "code-intel.md").read_text()
-    parts = content.split("---", 2)
-    meta = yaml.safe_load(parts[1])
+    _, meta = _agent("agents/code-intel.md")
+    assert meta is not None
     desc = meta["meta"]["description"]
     assert "python-dev:code-intel" in desc, "Description should reference python-dev:code-intel"
     assert "python-code-intel" not in desc, "Description should not use old name python-code-intel"
@@ -188,7 +232,7 @@ def test_code_intel_description_uses_new_namespace():
 
 def test_code_intel_has_prerequisite_validation():
     """code-intel agent includes prerequisite validation section."""
-    content = (ROOT / "agents" / "code-intel.md").read_text()
+    content, _ = _agent("agents/code-intel.md")
     assert "## Prerequisite Validation" in content, "Agent must have a '## Prerequisite Validation' section"
     # Must appear before strategies
     prereq_pos = content.index("## Prerequisite Validation")
@@ -200,9 +244,8 @@ def test_code_intel_has_prerequisite_validation():
 
 def test_code_intel_description_mentions_validation():
     """code-intel description mentions prerequisite validation."""
-    content = (ROOT / "agents" / "code-intel.md").read_text()
-    parts = content.split("---", 2)
-    meta = yaml.safe_load(parts[1])
+    _, meta = _agent("agents/code-intel.md")
+    assert meta is not None
     desc = meta["meta"]["description"].lower()
     assert "validates" in desc or "validation" in desc, "Description should mention validation"
     assert "install" in desc, "Description should mention installation guidance"
@@ -210,9 +253,8 @@ def test_code_intel_description_mentions_validation():
 
 def test_python_dev_agent_frontmatter():
     """python-dev agent has proper meta frontmatter with only quality tool."""
-    content = (ROOT / "agents" / "python-dev.md").read_text()
-    parts = content.split("---", 2)
-    meta = yaml.safe_load(parts[1])
+    _, meta = _agent("agents/python-dev.md")
+    assert meta is not None
     assert meta["meta"]["name"] == "python-dev"
     tools = meta["tools"]
     tool_modules = [t["module"] for t in tools]
@@ -225,11 +267,8 @@ def test_python_dev_agent_frontmatter():
 
 def test_all_yaml_valid():
     """All YAML files in the bundle parse without error."""
-    for yaml_file in ROOT.rglob("*.yaml"):
-        # Skip node_modules, .venv, etc.
-        if any(part.startswith(".") or part == "node_modules" for part in yaml_file.parts):
-            continue
-        content = yaml.safe_load(yaml_file.read_text())
+    for yaml_file in _iter_yaml(ROOT):
+        content = _load_yaml(Path(yaml_file).relative_to(ROOT).as_posix())
         assert content is not None, f"{yaml_file} is empty or invalid"
 
 
@@ -0,0 +1,90 @@
+"""Tests for PythonChecker behavior that spans several checks."""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from amplifier_bundle_python_dev import CheckConfig
+from amplifier_bundle_python_dev import PythonChecker
+from amplifier_bundle_python_dev import check_content
+from amplifier_bundle_python_dev import check_files
+from amplifier_bundle_python_dev import checker
+
+SOURCE = "def f():\n    # TODO: one\n    return 1  # TODO: two\n"
+
+
+@pytest.fixture
+def project():
+    # Not under pytest's tmp_path: the stub check skips any path containing "test"
+    with tempfile.TemporaryDirectory(prefix="python_check_") as root:
+        (Path(root) / "pkg").mkdir()
+        (Path(root) / "pkg" / "a.py").write_text(SOURCE)
+        yield Path(root)
+
+
+def _codes(result):
+    return sorted((issue.code, issue.line) for issue in result.issues)
+
+
+def test_todos_reported_by_stub_check_without_ruff_fixme_rules(project):
+    """Without flake8-fixme rules the stub check reports the TODOs."""
+    result = check_files([project / "pkg" / "a.py"], config=CheckConfig(enable_pyright=False))
+    assert _codes(result) == [("STUB", 2), ("STUB", 3)]
+
+
+def test_todos_reported_once_with_ruff_fixme_rules(project):
+    """When the project's ruff config enables FIX rules, each TODO is reported once, by ruff."""
+    (project / "pyproject.toml").write_text('[tool.ruff.lint]\nextend-select = ["FIX"]\n')
+    result = check_files([project / "pkg" / "a.py"], config=CheckConfig(enable_pyright=False))
+    assert _codes(result) == [("FIX002", 2), ("FIX002", 3)]
+
+
+def test_content_todos_reported_once_with_ruff_fixme_rules(project):
+    """check_content drops duplicate TODOs the same way."""
+    (project / "pyproject.toml").write_text('[tool.ruff.lint]\nextend-select = ["FIX"]\n')
+    result = check_content(SOURCE, str(project / "pkg" / "b.py"), config=CheckConfig(enable_pyright=False))
+    assert _codes(result) == [("FIX002", 2), ("FIX002", 3)]
+
+
+def test_stub_kept_when_ruff_skips_the_line(project):
+    """A marker ruff doesn't report (inside a string) is still reported by the stub check."""
+    (project / "pyproject.toml").write_text('[tool.ruff.lint]\nextend-select = ["FIX"]\n')
+    path = project / "pkg" / "c.py"
+    path.write_text('MESSAGE = "TODO"\n')
+    result = check_files([path], config=CheckConfig(enable_pyright=False))
+    assert _codes(result) == [("STUB", 1)]
+
+
+def test_parallel_stub_check_reuses_its_worker_pool(project, monkeypatch):
+    """Large stub checks share one worker pool across calls and match the serial results."""
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(checker, "STUB_PARALLEL_MIN_BYTES", 1)
+    files = []
+    for i in range(checker.STUB_SHARD_SIZE + 1):
+        files.append(project / "pkg" / f"m{i}.py")
+        files[-1].write_text(SOURCE)
+
+    parallel = PythonChecker(CheckConfig(enable_pyright=False))
+    first = parallel._run_stub_check(files)
+    pool = checker._stub_pool
+    assert pool is not None
+    assert parallel._run_stub_check(files) == first
+    assert checker._stub_pool is pool
+
+    serial = PythonChecker(CheckConfig(enable_pyright=False, stub_check_parallel=False))
+    assert first == serial._run_stub_check(files)
+    assert len(first.issues) == 2 * len(files)
+
+
+def test_stub_patterns_with_inline_flags(project):
+    """A pattern with an inline global flag can't be fused with the others, but still matches."""
+    config = CheckConfig(
+        enable_ruff_format=False,
+        enable_ruff_lint=False,
+        enable_pyright=False,
+        stub_patterns=[(r"(?i)hack\b", "HACK comment"), (r"\bTODO\b", "TODO comment")],
+    )
+    result = check_content("x = 1  # HACK here\n# todo later\ny = 2\n", str(project / "pkg" / "h.py"), config=config)
+    assert _codes(result) == [("STUB", 1), ("STUB", 2)]
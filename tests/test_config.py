@@ -0,0 +1,41 @@
+"""Tests for configuration loading."""
+
+import pytest
+
+from amplifier_bundle_python_dev.config import ENV_MAPPING
+from amplifier_bundle_python_dev.config import find_pyproject_toml
+from amplifier_bundle_python_dev.config import load_config
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """Empty project directory as the cwd, with no config environment variables set."""
+    for env_var in ENV_MAPPING:
+        monkeypatch.delenv(env_var, raising=False)
+    (tmp_path / "outer" / "inner").mkdir(parents=True)
+    monkeypatch.chdir(tmp_path / "outer" / "inner")
+    return tmp_path
+
+
+def test_pyproject_created_later_is_found(project):
+    """A pyproject.toml written after a lookup is picked up by the next one, even below an earlier hit."""
+    assert load_config().enable_pyright is True
+
+    (project / "outer" / "pyproject.toml").write_text("[tool.amplifier-python-dev]\nenable_pyright = false\n")
+    assert find_pyproject_toml() == project / "outer" / "pyproject.toml"
+    assert load_config().enable_pyright is False
+
+    (project / "outer" / "inner" / "pyproject.toml").write_text("[tool.amplifier-python-dev]\nauto_fix = true\n")
+    assert find_pyproject_toml() == project / "outer" / "inner" / "pyproject.toml"
+    assert (load_config().enable_pyright, load_config().auto_fix) == (True, True)
+
+
+def test_changes_to_a_loaded_config_do_not_leak(project):
+    """Each load_config() call returns its own config, even when served from the cache."""
+    config = load_config()
+    config.enable_pyright = False
+    config.exclude_patterns.append("generated/**")
+
+    fresh = load_config()
+    assert fresh.enable_pyright is True
+    assert "generated/**" not in fresh.exclude_patterns
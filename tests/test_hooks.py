@@ -0,0 +1,98 @@
+"""Tests for the python-check hook's batching and result cache."""
+
+import asyncio
+import os
+
+import pytest
+from amplifier_module_hooks_python_check import PythonCheckHooks
+
+import amplifier_bundle_python_dev
+from amplifier_bundle_python_dev import CheckResult
+from amplifier_bundle_python_dev import Issue
+from amplifier_bundle_python_dev import Severity
+
+
+def _issue(file: str, code: str = "F401") -> Issue:
+    return Issue(file=file, line=1, column=1, code=code, message="m", severity=Severity.ERROR, source="ruff-lint")
+
+
+@pytest.fixture
+def checked(monkeypatch):
+    """Record check_files calls; each checked file gets one issue."""
+    calls = []
+
+    def fake_check_files(paths, config=None, ruff_server=None):
+        calls.append(list(paths))
+        return CheckResult(issues=[_issue(path) for path in paths], files_checked=len(paths), checks_run=["ruff-lint"])
+
+    monkeypatch.setattr(amplifier_bundle_python_dev, "check_files", fake_check_files)
+    return calls
+
+
+@pytest.fixture
+def hooks(tmp_path):
+    hooks = PythonCheckHooks({"persistent_ruff": False, "batch_window_ms": 10}, working_dir=tmp_path)
+    yield hooks
+    hooks.close()
+
+
+async def test_concurrent_edits_share_one_check(hooks, checked):
+    """Files queued within the batch window are checked together and each waiter gets its own result."""
+    first, second, repeat = await asyncio.gather(
+        hooks._check_batched("a.py"), hooks._check_batched("b.py"), hooks._check_batched("a.py")
+    )
+
+    assert checked == [["a.py", "b.py"]]
+    assert [i.file for i in first.issues] == ["a.py"]
+    assert [i.file for i in second.issues] == ["b.py"]
+    assert repeat == first and repeat is not first and repeat.issues is not first.issues
+
+    await hooks._check_batched("c.py")
+    assert checked == [["a.py", "b.py"], ["c.py"]]
+
+
+async def test_check_failure_reaches_every_waiter(hooks, monkeypatch):
+    """An exception from check_files is raised to every caller in the batch."""
+    error = RuntimeError("checker crashed")
+
+    def failing_check_files(paths, config=None, ruff_server=None):
+        raise error
+
+    monkeypatch.setattr(amplifier_bundle_python_dev, "check_files", failing_check_files)
+    results = await asyncio.gather(
+        hooks._check_batched("a.py"), hooks._check_batched("b.py"), hooks._check_batched("a.py"), return_exceptions=True
+    )
+    assert results == [error, error, error]
+    assert hooks._pending == {} and hooks._flush_task is None
+
+
+def test_split_by_file(hooks, tmp_path):
+    """Issues go to the queued path they name, however it was spelled; tool-level issues go to all."""
+    relative = os.path.relpath(tmp_path / "a.py")
+    absolute = str(tmp_path / "b.py")
+    tool_level = _issue("", code="TOOL")
+    result = CheckResult(
+        issues=[_issue(str(tmp_path / "a.py")), _issue(absolute), tool_level, _issue(str(tmp_path / "other.py"))]
+    )
+
+    slices = hooks._split_by_file(result, [relative, absolute])
+    assert [(i.file, i.code) for i in slices[relative]] == [(str(tmp_path / "a.py"), "F401"), ("", "TOOL")]
+    assert [(i.file, i.code) for i in slices[absolute]] == [(absolute, "F401"), ("", "TOOL")]
+
+
+async def test_unchanged_file_reuses_result(hooks, checked, tmp_path):
+    """Repeated events for an unchanged file reuse the result; any content change re-checks it."""
+    path = tmp_path / "mod.py"
+    path.write_text("import os\n")
+    event = {"tool_name": "Write", "tool_input": {"file_path": str(path)}}
+
+    await hooks.handle_tool_post("tool:post", event)
+    await hooks.handle_tool_post("tool:post", event)
+    assert len(checked) == 1
+
+    # Same size and mtime, different content: caught by the content hash
+    st = path.stat()
+    path.write_text("import re\n")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    await hooks.handle_tool_post("tool:post", event)
+    assert len(checked) == 2
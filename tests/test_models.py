@@ -0,0 +1,57 @@
+"""Tests for the checking result and config models."""
+
+from amplifier_bundle_python_dev import CheckConfig
+from amplifier_bundle_python_dev import CheckResult
+from amplifier_bundle_python_dev import Issue
+from amplifier_bundle_python_dev import Severity
+
+
+def _issue(severity: Severity, line: int = 1) -> Issue:
+    return Issue(file="a.py", line=line, column=1, code="X", message="m", severity=severity, source="ruff-lint")
+
+
+def test_counts_follow_in_place_edits():
+    """Counts reflect the issues as they are now, including same-length edits."""
+    result = CheckResult(issues=[_issue(Severity.ERROR), _issue(Severity.INFO)])
+    assert (result.error_count, result.exit_code, result.summary) == (1, 2, "Found 1 error, 1 info in 0 files")
+
+    result.issues[0] = _issue(Severity.WARNING)
+    assert (result.error_count, result.warning_count, result.exit_code, result.success) == (0, 1, 1, True)
+
+    result.issues[0].severity = Severity.ERROR
+    assert (result.error_count, result.exit_code, result.success) == (1, 2, False)
+    assert result.to_tool_output()["error_count"] == 1
+
+
+def test_merge_keeps_check_order():
+    """merge and merge_all keep every issue and the first-seen order of checks."""
+    first = CheckResult(issues=[_issue(Severity.ERROR)], files_checked=2, checks_run=["ruff-format", "ruff-lint"])
+    second = CheckResult(issues=[_issue(Severity.WARNING)], files_checked=3, checks_run=["ruff-lint", "pyright"])
+
+    merged = first.merge(second)
+    assert merged.checks_run == ["ruff-format", "ruff-lint", "pyright"]
+    assert merged == CheckResult.merge_all([first, second])
+    assert (len(merged.issues), merged.files_checked) == (2, 3)
+
+
+def test_stub_regexes_follow_pattern_changes():
+    """Assigning or editing stub_patterns after construction takes effect."""
+    config = CheckConfig(stub_patterns=[(r"\bTODO\b", "TODO comment")])
+    assert [description for _, description in config.stub_regexes[0]] == ["TODO comment"]
+
+    config.stub_patterns = [(r"\bHACK\b", "HACK comment")]
+    assert [description for _, description in config.stub_regexes[0]] == ["HACK comment"]
+
+    config.stub_patterns.append((r"\bXXX\b", "XXX marker"))
+    regexes, prefilter, _ = config.stub_regexes
+    assert [description for _, description in regexes] == ["HACK comment", "XXX marker"]
+    assert prefilter is not None and prefilter.search("x = 1  # XXX")
+
+
+def test_stub_regexes_accept_inline_flag_patterns():
+    """Patterns that compile one at a time never make the property raise, even if they can't be fused."""
+    config = CheckConfig()
+    config.stub_patterns = [(r"(?i)hack\b", "HACK comment"), (r"\bTODO\b", "TODO comment")]
+    regexes, prefilter, lower_prefilter = config.stub_regexes
+    assert [description for _, description in regexes] == ["HACK comment", "TODO comment"]
+    assert (prefilter, lower_prefilter) == (None, None)
@@ -0,0 +1,180 @@
+"""Tests for the persistent ruff server client."""
+
+import sys
+import textwrap
+import time
+
+import pytest
+
+from amplifier_bundle_python_dev import CheckConfig
+from amplifier_bundle_python_dev import PythonChecker
+from amplifier_bundle_python_dev import ruff_server
+from amplifier_bundle_python_dev.ruff_server import RuffServer
+from amplifier_bundle_python_dev.ruff_server import RuffServerError
+
+# Minimal LSP server standing in for `ruff server`; RUFF_STUB_MODE picks how it
+# answers diagnostic requests: "ok", "hang" (never answers), "crash" (exits) or "error"
+STUB_SERVER = textwrap.dedent(
+    """
+    import json
+    import os
+    import sys
+
+    def read():
+        length = None
+        while True:
+            line = sys.stdin.buffer.readline()
+            if not line:
+                sys.exit(0)
+            if line == b"\\r\\n":
+                break
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return json.loads(sys.stdin.buffer.read(length))
+
+    def send(message):
+        body = json.dumps(message).encode()
+        sys.stdout.buffer.write(b"Content-Length: %d\\r\\n\\r\\n" % len(body) + body)
+        sys.stdout.buffer.flush()
+
+    mode = os.environ.get("RUFF_STUB_MODE", "ok")
+    while True:
+        message = read()
+        method = message.get("method")
+        if method == "initialize":
+            send({"jsonrpc": "2.0", "id": message["id"], "result": {"capabilities": {}}})
+        elif method == "textDocument/diagnostic":
+            if mode == "hang":
+                continue
+            if mode == "crash":
+                sys.exit(1)
+            if mode == "error":
+                send({"jsonrpc": "2.0", "id": message["id"], "error": {"code": -32603, "message": "boom"}})
+                continue
+            # Interleave a notification and a server-to-client request that must be answered first
+            send({"jsonrpc": "2.0", "method": "window/logMessage", "params": {"type": 3, "message": "hi"}})
+            send({"jsonrpc": "2.0", "id": "s1", "method": "workspace/configuration", "params": {"items": []}})
+            reply = read()
+            assert reply["id"] == "s1", reply
+            diagnostic = {
+                "range": {"start": {"line": 0, "character": 7}, "end": {"line": 0, "character": 9}},
+                "code": "F401",
+                "message": "`os` imported but unused\\n\\nhelp: remove it",
+                "data": {"title": "Remove unused import", "edits": [{}]},
+            }
+            send({"jsonrpc": "2.0", "id": message["id"], "result": {"kind": "full", "items": [diagnostic]}})
+        elif method == "textDocument/formatting":
+            send({"jsonrpc": "2.0", "id": message["id"], "result": [{"newText": ""}]})
+        elif method == "exit":
+            sys.exit(0)
+    """
+)
+
+
+@pytest.fixture
+def stub_server(tmp_path, monkeypatch):
+    """Point RuffServer at the stub LSP server instead of ruff."""
+    script = tmp_path / "stub_server.py"
+    script.write_text(STUB_SERVER)
+    monkeypatch.setattr(ruff_server, "ruff_command", lambda: (sys.executable, str(script)))
+    monkeypatch.setenv("RUFF_STUB_MODE", "ok")
+    return tmp_path
+
+
+@pytest.fixture
+def py_file(tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text("import os\n")
+    return path
+
+
+def test_check_returns_diagnostics_and_format_flag(stub_server, py_file):
+    """Diagnostics come back as-is; formatting edits mean the file would be reformatted."""
+    server = RuffServer(stub_server)
+    try:
+        diagnostics, needs_format = server.check(str(py_file), py_file.read_text())
+    finally:
+        server.close()
+    assert [d["code"] for d in diagnostics] == ["F401"]
+    assert needs_format is True
+
+
+def test_error_response_raises(stub_server, monkeypatch, py_file):
+    """A JSON-RPC error response surfaces as RuffServerError."""
+    monkeypatch.setenv("RUFF_STUB_MODE", "error")
+    server = RuffServer(stub_server)
+    try:
+        with pytest.raises(RuffServerError, match="boom"):
+            server.check(str(py_file), py_file.read_text(), format=False)
+    finally:
+        server.close()
+
+
+def test_timeout_discards_server_and_releases_lock(stub_server, monkeypatch, py_file):
+    """A server that never answers is killed after the timeout instead of blocking callers."""
+    monkeypatch.setenv("RUFF_STUB_MODE", "hang")
+    server = RuffServer(stub_server, timeout=0.5)
+    server._ensure_started()
+    process = server._process
+    assert process is not None
+
+    start = time.monotonic()
+    with pytest.raises(RuffServerError, match="did not answer"):
+        server.check(str(py_file), py_file.read_text(), format=False)
+    assert time.monotonic() - start < 5
+
+    assert server._process is None
+    assert process.poll() is not None
+    assert server._lock.acquire(blocking=False)
+    server._lock.release()
+
+
+def test_restarts_after_crash(stub_server, monkeypatch, py_file):
+    """After the server dies, the next check starts a new one."""
+    monkeypatch.setenv("RUFF_STUB_MODE", "crash")
+    server = RuffServer(stub_server)
+    try:
+        with pytest.raises(RuffServerError):
+            server.check(str(py_file), py_file.read_text(), format=False)
+
+        monkeypatch.setenv("RUFF_STUB_MODE", "ok")
+        diagnostics, _ = server.check(str(py_file), py_file.read_text(), format=False)
+        assert [d["code"] for d in diagnostics] == ["F401"]
+    finally:
+        server.close()
+
+
+def test_covers_only_paths_under_root(tmp_path):
+    """Only files inside the workspace root are resolved with the project's settings."""
+    server = RuffServer(tmp_path / "project")
+    assert server.covers(str(tmp_path / "project" / "pkg" / "mod.py"))
+    assert not server.covers(str(tmp_path / "elsewhere" / "mod.py"))
+
+
+def test_checker_uses_server_diagnostics(stub_server, py_file):
+    """Server diagnostics become ruff issues, without the extra help paragraph."""
+    server = RuffServer(stub_server)
+    checker = PythonChecker(CheckConfig(enable_pyright=False, enable_stub_check=False), ruff_server=server)
+    try:
+        result = checker.check_files([py_file])
+    finally:
+        server.close()
+    lint = [i for i in result.issues if i.source == "ruff-lint"]
+    assert [(i.code, i.line, i.column, i.message) for i in lint] == [("F401", 1, 8, "`os` imported but unused")]
+    assert any(i.code == "FORMAT" for i in result.issues)
+
+
+def test_checker_falls_back_to_cli_on_timeout(stub_server, monkeypatch, py_file):
+    """When the server hangs the checker still reports the ruff CLI's results."""
+    monkeypatch.setenv("RUFF_STUB_MODE", "hang")
+    server = RuffServer(stub_server, timeout=0.5)
+    checker = PythonChecker(
+        CheckConfig(enable_ruff_format=False, enable_pyright=False, enable_stub_check=False), ruff_server=server
+    )
+    # Only the server is stubbed; the CLI fallback in the checker runs the real ruff
+    try:
+        result = checker.check_files([py_file])
+    finally:
+        server.close()
+    assert "F401" in {i.code for i in result.issues}
@@ -0,0 +1,186 @@
+"""Tests for the python_check tool's result caches."""
+
+import os
+
+import amplifier_module_tool_python_check as tool_module
+import pytest
+from amplifier_module_tool_python_check import PythonCheckTool
+from amplifier_module_tool_python_check import _snapshot_tree
+
+import amplifier_bundle_python_dev
+from amplifier_bundle_python_dev import CheckConfig
+from amplifier_bundle_python_dev import CheckResult
+from amplifier_bundle_python_dev import Issue
+from amplifier_bundle_python_dev import Severity
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Project with two packages, where a imports b."""
+    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'demo'\n")
+    for package in ("a", "b"):
+        (tmp_path / "src" / package).mkdir(parents=True)
+        (tmp_path / "src" / package / "__init__.py").write_text("")
+    (tmp_path / "src" / "b" / "mod.py").write_text("def value() -> int:\n    return 1\n")
+    (tmp_path / "src" / "a" / "use.py").write_text("from b.mod import value\n\nx: int = value()\n")
+    return tmp_path
+
+
+def _touch(path, content):
+    """Rewrite a file and bump its mtime so the change is visible even within one clock tick."""
+    path.write_text(content)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def counting_tool(monkeypatch):
+    """Tool whose check runs are counted instead of executed."""
+    tool = PythonCheckTool()
+    calls = []
+
+    async def fake_run_checks(paths, config, fix, jobs):
+        calls.append((list(paths), fix))
+        return CheckResult(files_checked=len(calls))
+
+    monkeypatch.setattr(tool, "_run_checks", fake_run_checks)
+    return tool, calls
+
+
+def test_snapshot_covers_the_whole_project(project):
+    """Editing a module outside the requested directory changes its snapshot."""
+    before = _snapshot_tree([project / "src" / "a"])
+    _touch(project / "src" / "b" / "mod.py", "def value() -> str:\n    return ''\n")
+    assert _snapshot_tree([project / "src" / "a"]) != before
+
+
+def test_snapshot_covers_stubs_and_the_environment(project):
+    """Stub files, py.typed markers and packages installed into the project's .venv change the snapshot."""
+    site_packages = project / ".venv" / "lib" / "python3.11" / "site-packages"
+    site_packages.mkdir(parents=True)
+    snapshots = [_snapshot_tree([project])]
+
+    _touch(project / "src" / "b" / "mod.pyi", "def value() -> int: ...\n")
+    snapshots.append(_snapshot_tree([project]))
+    (project / "src" / "b" / "py.typed").write_text("")
+    snapshots.append(_snapshot_tree([project]))
+    (site_packages / "newpkg").mkdir()
+    os.utime(site_packages, ns=(0, site_packages.stat().st_mtime_ns + 1_000_000_000))
+    snapshots.append(_snapshot_tree([project]))
+    assert len(set(snapshots)) == 4
+
+
+async def test_directory_results_reused_until_a_dependency_changes(project, counting_tool):
+    """A cached directory result is dropped when a module it imports from changes."""
+    tool, calls = counting_tool
+    paths = [str(project / "src" / "a")]
+
+    await tool.execute({"paths": paths})
+    await tool.execute({"paths": paths})
+    assert len(calls) == 1
+
+    _touch(project / "src" / "b" / "mod.py", "def value() -> str:\n    return ''\n")
+    await tool.execute({"paths": paths})
+    assert len(calls) == 2
+
+
+async def test_content_results_reused_until_the_project_changes(project, monkeypatch):
+    """Content results are keyed on the project they were checked in, not just the content."""
+    calls = []
+
+    def fake_check_content(content, config=None):
+        calls.append(content)
+        return CheckResult(files_checked=1)
+
+    monkeypatch.setattr(amplifier_bundle_python_dev, "check_content", fake_check_content)
+    monkeypatch.chdir(project)
+    tool = PythonCheckTool()
+    content = "from b.mod import value\n\nx: int = value()\n"
+
+    await tool.execute({"content": content})
+    await tool.execute({"content": content})
+    assert len(calls) == 1
+
+    # The content's verdict depends on the modules it imports
+    _touch(project / "src" / "b" / "mod.py", "def value() -> str:\n    return ''\n")
+    await tool.execute({"content": content})
+    assert len(calls) == 2
+
+    await tool.execute({"content": content, "checks": ["lint"]})
+    assert len(calls) == 3
+
+
+async def test_lint_only_content_results_track_only_config_files(project, monkeypatch):
+    """Without pyright, content results survive module edits but not config edits."""
+    calls = []
+
+    def fake_check_content(content, config=None):
+        calls.append(content)
+        return CheckResult(files_checked=1)
+
+    monkeypatch.setattr(amplifier_bundle_python_dev, "check_content", fake_check_content)
+    monkeypatch.chdir(project)
+    tool = PythonCheckTool()
+    args = {"content": "import os\n", "checks": ["lint"]}
+
+    await tool.execute(args)
+    _touch(project / "src" / "b" / "mod.py", "def value() -> str:\n    return ''\n")
+    await tool.execute(args)
+    assert len(calls) == 1
+
+    _touch(project / "pyproject.toml", "[project]\nname = 'demo'\n\n[tool.ruff]\nline-length = 100\n")
+    await tool.execute(args)
+    assert len(calls) == 2
+
+    # Outside a project, pyright results aren't cached at all
+    (project / "pyproject.toml").unlink()
+    await tool.execute({"content": "import os\n", "checks": ["types"]})
+    await tool.execute({"content": "import os\n", "checks": ["types"]})
+    assert len(calls) == 4
+
+
+def test_snapshot_gives_up_on_huge_trees(project, monkeypatch):
+    """Trees bigger than the entry limit aren't snapshotted (so results for them aren't cached)."""
+    monkeypatch.setattr(tool_module, "MAX_SNAPSHOT_ENTRIES", 3)
+    assert _snapshot_tree([project]) is None
+
+
+async def test_fix_pass_rechecks_types_only_in_rewritten_files(project, monkeypatch):
+    """pyright is skipped in the fix pass and re-run on the files ruff rewrote, so their lines are current."""
+    tool = PythonCheckTool()
+    use, mod = str(project / "src" / "a" / "use.py"), str(project / "src" / "b" / "mod.py")
+    calls = []
+
+    def issue(file, line, code, source, fixable=False):
+        return Issue(file, line, 1, code, "m", Severity.ERROR, source, fixable=fixable)
+
+    async def fake_run_checks(paths, config, fix, jobs):
+        calls.append((list(paths), config.enable_ruff_lint, config.enable_pyright, fix))
+        if fix:
+            # Removing an import moves use.py's type error up; mod.py's fix turns out to be a no-op
+            _touch(project / "src" / "a" / "use.py", "x: int = 1\n")
+            return CheckResult(issues=[issue(use, 1, "E501", "ruff-lint")], files_checked=2, checks_run=["ruff-lint"])
+        if not config.enable_ruff_lint:
+            return CheckResult(issues=[issue(use, 1, "E1", "pyright")], files_checked=1, checks_run=["pyright"])
+        issues = [
+            issue(use, 1, "F401", "ruff-lint", fixable=True),
+            issue(use, 3, "E1", "pyright"),
+            issue(mod, 1, "F401", "ruff-lint", fixable=True),
+            issue(mod, 2, "E2", "pyright"),
+        ]
+        return CheckResult(issues=issues, files_checked=2, checks_run=["ruff-lint", "pyright"])
+
+    monkeypatch.setattr(tool, "_run_checks", fake_run_checks)
+    result = await tool._fix_paths([use, mod], CheckConfig(), jobs=1)
+
+    assert calls == [
+        ([use, mod], True, True, False),
+        ([use, mod], True, False, True),
+        ([use], False, True, False),
+    ]
+    assert sorted((i.file, i.line, i.code) for i in result.issues) == [
+        (use, 1, "E1"),
+        (use, 1, "E501"),
+        (mod, 2, "E2"),
+    ]
+    assert (result.files_checked, result.checks_run) == (2, ["ruff-lint", "pyright"])